@@ -2,6 +2,7 @@
 from .cli import main
 from .realtime import RealtimeTranscriber
 from .recorder import MicrophoneRecorder
+from .server import TranscriptionServer
 from .transcriber import TranscriptionResult, WhisperTranscriber
 
 __all__ = [
@@ -9,5 +10,6 @@ __all__ = [
     "MicrophoneRecorder",
     "RealtimeTranscriber",
     "TranscriptionResult",
+    "TranscriptionServer",
     "WhisperTranscriber",
 ]
@@ -2,13 +2,13 @@
 
 import argparse
 import sys
-import tempfile
-import time
+import threading
 from datetime import datetime
 from pathlib import Path
 
 from .recorder import MicrophoneRecorder
 from .realtime import RealtimeTranscriber
+from .server import TranscriptionServer, transcribe_via_server
 from .transcriber import WhisperTranscriber
 
 
@@ -19,11 +19,16 @@ def cmd_file(args: argparse.Namespace) -> None:
         print(f"Error: File not found: {input_path}", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Loading model: {args.model}")
-    transcriber = WhisperTranscriber(model_name=args.model, language=args.language)
+    # 常駐サーバーが起動していればモデルのロードを省略できる
+    result = transcribe_via_server(args.model, args.language, path=input_path, fast=args.fast)
+    if result is not None:
+        print(f"Transcribed via server: {input_path}")
+    else:
+        print(f"Loading model: {args.model}")
+        transcriber = WhisperTranscriber(model_name=args.model, language=args.language, fast=args.fast)
 
-    print(f"Transcribing: {input_path}")
-    result = transcriber.transcribe(input_path)
+        print(f"Transcribing: {input_path}")
+        result = transcriber.transcribe(input_path)
 
     # 出力先の決定（指定がなければ入力ファイルと同名の.txt）
     if args.output:
@@ -57,9 +62,9 @@ def cmd_record(args: argparse.Namespace) -> None:
     else:
         print("Recording... Press Ctrl+C to stop")
         recorder.start_recording()
+        # ポーリングせずにCtrl+Cまでメインスレッドを眠らせる
         try:
-            while True:
-                time.sleep(0.1)
+            threading.Event().wait()
         except KeyboardInterrupt:
             pass
         audio = recorder.stop_recording()
@@ -75,23 +80,16 @@ def cmd_record(args: argparse.Namespace) -> None:
         recorder.save_wav(audio, wav_path)
         print(f"Audio saved: {wav_path}")
 
-    # 文字起こし（保存済みWAVがあれば再利用、なければ一時ファイル経由）
-    print(f"\nLoading model: {args.model}")
-    transcriber = WhisperTranscriber(model_name=args.model, language=args.language)
-
-    if args.save_audio:
-        print("Transcribing...")
-        result = transcriber.transcribe(wav_path)
+    # 文字起こし（録音済みの配列をそのまま渡し、WAVの書き出し・再読み込みを省く）
+    result = transcribe_via_server(args.model, args.language, audio=audio)
+    if result is not None:
+        print("\nTranscribed via server.")
     else:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = Path(f.name)
-            recorder.save_wav(audio, temp_path)
+        print(f"\nLoading model: {args.model}")
+        transcriber = WhisperTranscriber(model_name=args.model, language=args.language)
 
         print("Transcribing...")
-        try:
-            result = transcriber.transcribe(temp_path)
-        finally:
-            temp_path.unlink(missing_ok=True)
+        result = transcriber.transcribe_array(audio)
 
     # 結果をテキストファイルに保存
     txt_path = output_dir / f"{output_base}.txt"
@@ -145,6 +143,19 @@ def cmd_devices(args: argparse.Namespace) -> None:
     print()
 
 
+def cmd_serve(args: argparse.Namespace) -> None:
+    """Whisperモデルを常駐させ、file/recordコマンドからの要求を処理する"""
+    with TranscriptionServer(model_name=args.model) as server:
+        print(f"Loading model: {args.model}")
+        server.warm_up()
+        print(f"Listening on {server.socket_path}. Press Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    print("\nServer stopped.")
+
+
 def main() -> None:
     # CLIのメインエントリーポイント（サブコマンドのディスパッチ）
     parser = argparse.ArgumentParser(
@@ -168,6 +179,11 @@ def main() -> None:
         default="ja",
         help="Language code (default: ja)",
     )
+    file_parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Trade accuracy for speed: greedy decoding, long files decoded in batches",
+    )
     file_parser.set_defaults(func=cmd_file)
 
     # record command
@@ -234,6 +250,16 @@ def main() -> None:
     )
     realtime_parser.set_defaults(func=cmd_realtime)
 
+    # serve command
+    serve_parser = subparsers.add_parser("serve", help="Keep the model loaded for file/record")
+    serve_parser.add_argument(
+        "-m", "--model",
+        choices=["tiny", "base", "small", "medium", "large-v3"],
+        default="large-v3",
+        help="Whisper model size to preload (default: large-v3)",
+    )
+    serve_parser.set_defaults(func=cmd_serve)
+
     # devices command
     devices_parser = subparsers.add_parser("devices", help="List audio devices")
     devices_parser.set_defaults(func=cmd_devices)
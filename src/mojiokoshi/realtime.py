@@ -1,23 +1,29 @@
 """Realtime transcription with VAD (Voice Activity Detection)."""
 
 import logging
-import tempfile
+import queue
 import threading
-from pathlib import Path
 from typing import Callable
 
 import numpy as np
-from scipy.io import wavfile
 
-from .recorder import INT16_MAX, MicrophoneRecorder
+from .recorder import MicrophoneRecorder
 from .transcriber import WhisperTranscriber
 
 logger = logging.getLogger(__name__)
 
 
+# 停止時、文字起こしワーカーが残りの発話を処理し終えるまでの待機中に進捗を表示する間隔（秒）
+STOP_PROGRESS_INTERVAL_SEC = 30
+# 未処理の発話がこの件数を超えたら文字起こしが追いついていないと警告する
+BACKLOG_WARNING_SIZE = 8
+# ウォームアップに使う無音の長さ（エンコーダーは30秒にパディングするため短くてよい）
+WARMUP_DURATION_SEC = 0.1
+
+
 class RealtimeTranscriber:
     """音声活動検出(VAD)に基づくリアルタイム文字起こしクラス。
-    無音区間を検出して発話単位でWhisperに送る。"""
+    無音区間を検出して発話単位でキューに積み、ワーカーがまとめてWhisperに送る。"""
 
     def __init__(
         self,
@@ -28,36 +34,44 @@ class RealtimeTranscriber:
         min_audio_length: float = 1.0,
         on_transcription: Callable[[str], None] | None = None,
         device: int | None = None,
+        batch_size: int = 4,
     ):
         self.recorder = MicrophoneRecorder(device=device)
-        self.transcriber = WhisperTranscriber(model_name=model_name, language=language)
+        self.transcriber = WhisperTranscriber(model_name=model_name, language=language, fast=True)
         self.silence_threshold = silence_threshold
         self.silence_duration = silence_duration
         self.min_audio_length = min_audio_length
         self.on_transcription = on_transcription or print
+        self.batch_size = batch_size
 
-        self._buffer: list[np.ndarray] = []
+        # 発話の音声バッファ（発話ごとに使い回し、足りない時だけ拡張する）
+        self._buffer = np.empty(0, dtype=np.float32)
+        self._buffer_len = 0
         self._lock = threading.Lock()
         self._silence_samples = 0
         self._is_speaking = False
         self._stop_event = threading.Event()
-        self._transcription_thread: threading.Thread | None = None
+        # 発話単位の音声キュー（Noneはワーカー終了の合図）
+        self._queue: queue.Queue[np.ndarray | None] = queue.Queue()
+        self._worker: threading.Thread | None = None
         self._all_text: list[str] = []
+        # VAD用の作業領域（録音コールバックごとの一時配列確保を避ける）
+        self._abs_scratch = np.empty(0, dtype=np.float32)
 
     def _process_chunk(self, chunk: np.ndarray) -> None:
         """音声チャンクのVAD判定を行い、無音が続いたら文字起こしをトリガーする"""
-        amplitude = np.abs(chunk).mean()
+        amplitude = self._mean_amplitude(chunk)
         is_speech = amplitude > self.silence_threshold
 
         should_transcribe = False
         with self._lock:
             if is_speech:
-                self._buffer.append(chunk)
+                self._append_to_buffer(chunk)
                 self._silence_samples = 0
                 self._is_speaking = True
             else:
                 if self._is_speaking:
-                    self._buffer.append(chunk)
+                    self._append_to_buffer(chunk)
                     self._silence_samples += len(chunk)
 
                     # 無音が閾値を超えたら発話終了とみなす
@@ -68,14 +82,36 @@ class RealtimeTranscriber:
         if should_transcribe:
             self._transcribe_buffer()
 
+    def _append_to_buffer(self, chunk: np.ndarray) -> None:
+        """チャンクをバッファ末尾にコピーする（ロック内で呼ぶこと）"""
+        end = self._buffer_len + len(chunk)
+        if end > len(self._buffer):
+            # 容量を倍々に拡張し、長い発話でも再確保の回数を抑える
+            grown = np.empty(max(end, 2 * len(self._buffer)), dtype=np.float32)
+            grown[:self._buffer_len] = self._buffer[:self._buffer_len]
+            self._buffer = grown
+        self._buffer[self._buffer_len:end] = chunk
+        self._buffer_len = end
+
+    def _mean_amplitude(self, chunk: np.ndarray) -> float:
+        """チャンクの平均絶対振幅を求める。絶対値は使い回しの作業領域に書き込み、
+        add.reduceで直接合計することで一時配列の確保とmean()の余分な処理を省く。"""
+        n = len(chunk)
+        if n == 0:
+            return 0.0
+        if len(self._abs_scratch) < n:
+            self._abs_scratch = np.empty(n, dtype=np.float32)
+        abs_chunk = np.abs(chunk, out=self._abs_scratch[:n])
+        return float(np.add.reduce(abs_chunk)) / n
+
     def _transcribe_buffer(self) -> None:
-        """バッファに蓄積した音声を別スレッドで文字起こしする"""
+        """バッファに蓄積した音声を文字起こしキューに積む（録音コールバックはブロックしない）"""
         with self._lock:
-            if not self._buffer:
+            if self._buffer_len == 0:
                 return
 
-            audio = np.concatenate(self._buffer).flatten()
-            self._buffer = []
+            audio = self._buffer[:self._buffer_len].copy()
+            self._buffer_len = 0
             self._is_speaking = False
             self._silence_samples = 0
 
@@ -84,59 +120,77 @@ class RealtimeTranscriber:
         if len(audio) < min_samples:
             return
 
-        # 前の文字起こしスレッドの完了を待つ（デッドロック防止のためロック外で実行）
-        if self._transcription_thread is not None and self._transcription_thread.is_alive():
-            self._transcription_thread.join(timeout=30)
-
-        # 録音コールバックをブロックしないよう別スレッドで文字起こし
-        def transcribe() -> None:
-            temp_path: Path | None = None
-            try:
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                    temp_path = Path(f.name)
-                    audio_int16 = (audio * INT16_MAX).astype(np.int16)
-                    wavfile.write(temp_path, self.recorder.sample_rate, audio_int16)
-
-                result = self.transcriber.transcribe(temp_path)
-
-                if result.text.strip():
-                    with self._lock:
-                        self._all_text.append(result.text.strip())
-                    self.on_transcription(result.text.strip())
-            except Exception:
-                logger.exception("Transcription error")
-            finally:
-                if temp_path is not None:
-                    temp_path.unlink(missing_ok=True)
-
-        self._transcription_thread = threading.Thread(target=transcribe)
-        self._transcription_thread.start()
+        # 録音コールバックから呼ばれるため、キューが詰まってもブロックせずに積んで警告だけ出す
+        self._queue.put(audio)
+        backlog = self._queue.qsize()
+        if backlog > BACKLOG_WARNING_SIZE:
+            logger.warning("Transcription is falling behind (%d utterances pending)", backlog)
+
+    def _transcription_worker(self) -> None:
+        """キューから発話を取り出して文字起こしする。
+        文字起こし中に溜まった発話は最大batch_size件までまとめて1回で処理する。"""
+        while True:
+            audio = self._queue.get()
+            if audio is None:
+                return
+
+            batch = [audio]
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    audio = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if audio is None:
+                    stopping = True
+                    break
+                batch.append(audio)
+
+            self._transcribe_batch(batch)
+            if stopping:
+                return
+
+    def _transcribe_batch(self, batch: list[np.ndarray]) -> None:
+        """発話のバッチを文字起こしし、発話順に結果を通知する"""
+        try:
+            results = self.transcriber.transcribe_batch(batch)
+        except Exception:
+            logger.exception("Transcription error")
+            return
+
+        for result in results:
+            text = result.text.strip()
+            if text:
+                with self._lock:
+                    self._all_text.append(text)
+                # コールバックの失敗（出力先のパイプが閉じた等）でワーカーを止めず、以降の発話も処理する
+                try:
+                    self.on_transcription(text)
+                except Exception:
+                    logger.exception("Transcription callback error")
 
     def start(self) -> None:
         """リアルタイム文字起こしを開始する（Ctrl+Cで停止）"""
         logger.info("Loading model: %s...", self.transcriber.model_name)
         # モデルの初回ロードを事前に行い、最初の文字起こしの遅延を軽減する
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = Path(f.name)
-            silence = np.zeros(self.recorder.sample_rate, dtype=np.int16)
-            wavfile.write(temp_path, self.recorder.sample_rate, silence)
+        # 実際の発話と同じバッチ経路に短い無音を通し、モデルのロードとカーネルのコンパイルを済ませる
+        silence = np.zeros(int(WARMUP_DURATION_SEC * self.recorder.sample_rate), dtype=np.float32)
         try:
-            self.transcriber.transcribe(temp_path)
+            self.transcriber.transcribe_batch([silence])
         except Exception:
             logger.warning("Model warmup failed", exc_info=True)
-        finally:
-            temp_path.unlink(missing_ok=True)
 
         logger.info("Realtime transcription started. Press Ctrl+C to stop.")
 
         self._stop_event.clear()
         self._all_text = []
+        self._worker = threading.Thread(target=self._transcription_worker, daemon=True)
+        self._worker.start()
         self.recorder.start_recording(on_chunk=self._process_chunk)
 
-        # Ctrl+Cまたはstop_eventが発火するまで待機する
+        # Ctrl+Cまたはstop()によるstop_eventのセットまで待機する
         try:
-            while not self._stop_event.is_set():
-                self._stop_event.wait(0.1)
+            self._stop_event.wait()
         except KeyboardInterrupt:
             pass
 
@@ -147,14 +201,21 @@ class RealtimeTranscriber:
         self._stop_event.set()
         self.recorder.stop_recording()
 
-        # 残りのバッファを文字起こし（デッドロック防止のためロック外で実行）
+        # 残りのバッファをキューに積む（デッドロック防止のためロック外で実行）
         self._transcribe_buffer()
 
-        # 最後の文字起こしスレッドの完了を待つ
-        if self._transcription_thread:
-            self._transcription_thread.join(timeout=30)
-            if self._transcription_thread.is_alive():
-                logger.warning("Transcription thread did not finish in time")
+        # キューに残った発話をすべて処理し終えるまでワーカーを待つ
+        # （キューは上限なしのため、途中で打ち切ると保存されるテキストから発話が欠ける）
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout=STOP_PROGRESS_INTERVAL_SEC)
+            while self._worker.is_alive():
+                logger.info(
+                    "Waiting for transcription to finish (%d utterances pending)...",
+                    self._queue.qsize(),
+                )
+                self._worker.join(timeout=STOP_PROGRESS_INTERVAL_SEC)
+            self._worker = None
 
         logger.info("Realtime transcription stopped.")
         with self._lock:
@@ -1,20 +1,59 @@
 """Microphone recording module using sounddevice."""
 
+import functools
 import logging
+import wave
 from pathlib import Path
 from typing import Callable
 
 import numpy as np
 import sounddevice as sd
-from scipy.io import wavfile
 
 logger = logging.getLogger(__name__)
 
 # 音声フォーマット定数
+INT16_MIN = -32768
 INT16_MAX = 32767
+# float32⇔int16の変換係数（2^15）。ffmpeg/mlx-whisperと同じ係数にして、int16→float32→int16を可逆にする
+# （float32の係数にしておくと、Pythonのintを掛けた場合と違いfloat64の一時配列ができない）
+INT16_SCALE = np.float32(1 << 15)
 CHUNK_DURATION_SEC = 0.5
 
 
+def float_to_int16(
+    audio: np.ndarray,
+    out: np.ndarray | None = None,
+    scratch: np.ndarray | None = None,
+) -> np.ndarray:
+    """float32音声（-1.0〜1.0）をint16に変換する。最も近い整数に丸め、範囲外の値は飽和させる。
+    outとscratch（同じ長さのfloat32配列）を渡すとそこに書き込み、一時配列の確保を省く。"""
+    scaled = np.multiply(audio, INT16_SCALE, out=scratch, dtype=np.float32)
+    np.rint(scaled, out=scaled)
+    np.clip(scaled, INT16_MIN, INT16_MAX, out=scaled)
+    if out is None:
+        return scaled.astype(np.int16)
+    out[...] = scaled
+    return out
+
+
+@functools.lru_cache(maxsize=1)
+def _query_input_devices() -> tuple[dict, ...]:
+    """PortAudioに入力デバイスを問い合わせる（結果はlist_devicesでキャッシュする）"""
+    devices = sd.query_devices()
+    # 既定の入力デバイスはループ外で1回だけ問い合わせる
+    default_input = sd.query_devices(kind="input")
+    return tuple(
+        {
+            "id": i,
+            "name": d["name"],
+            "channels": d["max_input_channels"],
+            "default": d == default_input,
+        }
+        for i, d in enumerate(devices)
+        if d["max_input_channels"] > 0
+    )
+
+
 class MicrophoneRecorder:
     """マイクからの音声録音を管理するクラス。
     ブロッキング録音とストリーミング録音の両方に対応する。"""
@@ -30,21 +69,18 @@ class MicrophoneRecorder:
         self.device = device
         self._frames: list[np.ndarray] = []
         self._stream: sd.InputStream | None = None
+        # WAV保存用の変換バッファ（保存ごとに使い回し、足りない時だけ拡張する）
+        self._int16_buffer = np.empty(0, dtype=np.int16)
+        self._float_scratch = np.empty(0, dtype=np.float32)
 
     @staticmethod
-    def list_devices() -> list[dict]:
-        """利用可能な入力デバイスの一覧を取得する"""
-        devices = sd.query_devices()
-        result = []
-        for i, d in enumerate(devices):
-            if d["max_input_channels"] > 0:
-                result.append({
-                    "id": i,
-                    "name": d["name"],
-                    "channels": d["max_input_channels"],
-                    "default": d == sd.query_devices(kind="input"),
-                })
-        return result
+    def list_devices(refresh: bool = False) -> list[dict]:
+        """利用可能な入力デバイスの一覧を取得する。
+        PortAudioへの問い合わせ結果はキャッシュし、refresh=Trueの時だけ問い合わせ直す。"""
+        if refresh:
+            _query_input_devices.cache_clear()
+        # 呼び出し側で変更されてもキャッシュが壊れないようコピーを返す
+        return [dict(d) for d in _query_input_devices()]
 
     def record_blocking(self, duration: float) -> np.ndarray:
         """指定秒数だけ録音して完了を待つ"""
@@ -68,10 +104,12 @@ class MicrophoneRecorder:
         def callback(indata, frame_count, time_info, status) -> None:
             if status:
                 logger.warning("Audio stream status: %s", status)
+            # indataはPortAudioが再利用するためコピーは1回だけ取り、
+            # コールバックには同じデータの1次元ビューを渡す（受け取り側で保持する場合はコピーすること）
             data = indata.copy()
             self._frames.append(data)
             if on_chunk:
-                on_chunk(data.flatten())
+                on_chunk(data.reshape(-1))
 
         self._stream = sd.InputStream(
             samplerate=self.sample_rate,
@@ -97,5 +135,14 @@ class MicrophoneRecorder:
     def save_wav(self, audio: np.ndarray, path: Path | str) -> None:
         """float32音声をint16に変換してWAVファイルに保存する"""
         path = Path(path)
-        audio_int16 = (audio * INT16_MAX).astype(np.int16)
-        wavfile.write(path, self.sample_rate, audio_int16)
+        n = len(audio)
+        if len(self._int16_buffer) < n:
+            self._int16_buffer = np.empty(n, dtype=np.int16)
+            self._float_scratch = np.empty(n, dtype=np.float32)
+        audio_int16 = float_to_int16(audio, out=self._int16_buffer[:n], scratch=self._float_scratch[:n])
+        # 標準ライブラリのwaveで16bit PCMとして書き込む（変換済みバッファをそのまま渡す）
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.sample_rate)
+            w.writeframes(audio_int16)
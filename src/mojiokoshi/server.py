@@ -0,0 +1,156 @@
+"""Warm transcription server that keeps the Whisper model loaded between CLI calls."""
+
+import json
+import logging
+import os
+import tempfile
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+
+import numpy as np
+
+from .transcriber import TranscriptionResult, WhisperTranscriber
+
+logger = logging.getLogger(__name__)
+
+# サーバーの待ち受けソケット（ユーザーごとのランタイムディレクトリを優先する）
+SOCKET_PATH = Path(
+    os.environ.get(
+        "MOJIOKOSHI_SOCKET",
+        Path(os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir())) / "mojiokoshi.sock",
+    )
+)
+
+
+class TranscriptionServer:
+    """Whisperモデルを常駐させ、Unixソケット経由の文字起こし要求を処理するサーバー。
+    要求と応答はJSON（音声配列は生のfloat32バイト列）でやり取りし、pickleは使わない。"""
+
+    def __init__(self, model_name: str = "large-v3", socket_path: Path | str = SOCKET_PATH):
+        self.model_name = model_name
+        self.socket_path = Path(socket_path)
+        self._listener: Listener | None = None
+
+    def __enter__(self) -> "TranscriptionServer":
+        self.listen()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def listen(self) -> None:
+        """ソケットを作成して待ち受けを開始する"""
+        if self.socket_path.exists():
+            if request_transcription({"ping": True}, self.socket_path) is not None:
+                raise RuntimeError(f"Server already running: {self.socket_path}")
+            # 前回異常終了したサーバーのソケットが残っている
+            self.socket_path.unlink()
+
+        # 他ユーザーから接続できないよう所有者のみ読み書き可能で作成する
+        old_umask = os.umask(0o177)
+        try:
+            self._listener = Listener(str(self.socket_path), family="AF_UNIX")
+        finally:
+            os.umask(old_umask)
+
+    def close(self) -> None:
+        """待ち受けを終了してソケットを削除する"""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def warm_up(self) -> None:
+        """無音を文字起こししてモデルをメモリにロードしておく"""
+        transcriber = WhisperTranscriber(model_name=self.model_name)
+        transcriber.transcribe_array(np.zeros(16000, dtype=np.float32))
+
+    def serve_forever(self) -> None:
+        """Ctrl+Cまで要求を1件ずつ処理する"""
+        while True:
+            self.handle_request()
+
+    def handle_request(self) -> None:
+        """接続を1件受け付けて文字起こし結果を返す。
+        クライアントが途中で切断（Ctrl+C等）してもサーバーは止めずに次の要求を待つ。"""
+        try:
+            conn = self._listener.accept()
+        except (OSError, EOFError) as e:
+            logger.warning("Failed to accept connection: %s", e)
+            return
+
+        with conn:
+            try:
+                request = json.loads(conn.recv_bytes())
+                response = self._handle(request, conn)
+            except Exception as e:
+                logger.exception("Request failed")
+                response = {"error": str(e)}
+            try:
+                conn.send_bytes(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+            except (OSError, EOFError) as e:
+                logger.warning("Client disconnected before the response was sent: %s", e)
+
+    def _handle(self, request: dict, conn: Connection) -> dict:
+        if request.get("ping"):
+            return {"ok": True}
+
+        transcriber = WhisperTranscriber(
+            model_name=request.get("model", self.model_name),
+            language=request.get("language", "ja"),
+            fast=request.get("fast", False),
+        )
+        if "path" in request:
+            result = transcriber.transcribe(request["path"])
+        else:
+            audio = np.frombuffer(conn.recv_bytes(), dtype=np.float32)
+            result = transcriber.transcribe_array(audio)
+
+        return {"text": result.text, "segments": result.segments, "language": result.language}
+
+
+def request_transcription(
+    request: dict,
+    socket_path: Path | str = SOCKET_PATH,
+    audio: np.ndarray | None = None,
+) -> dict | None:
+    """起動中のサーバーに要求を送る。サーバーに接続できない、または応答の前に
+    接続が切れた（サーバーの終了・再起動等）場合はNoneを返す。"""
+    try:
+        conn = Client(str(socket_path), family="AF_UNIX")
+    except OSError:
+        return None
+
+    with conn:
+        try:
+            conn.send_bytes(json.dumps(request, ensure_ascii=False).encode("utf-8"))
+            if audio is not None:
+                conn.send_bytes(audio.astype(np.float32, copy=False).tobytes())
+            response = json.loads(conn.recv_bytes())
+        except (OSError, EOFError) as e:
+            logger.warning("Transcription server closed the connection: %s", e)
+            return None
+
+    if "error" in response:
+        raise RuntimeError(f"Transcription server error: {response['error']}")
+    return response
+
+
+def transcribe_via_server(
+    model_name: str,
+    language: str,
+    path: Path | str | None = None,
+    audio: np.ndarray | None = None,
+    socket_path: Path | str = SOCKET_PATH,
+    fast: bool = False,
+) -> TranscriptionResult | None:
+    """サーバー経由で音声ファイルまたは音声配列を文字起こしする。
+    サーバーが起動していなければNoneを返すので、呼び出し側でプロセス内処理に切り替える。"""
+    request = {"model": model_name, "language": language, "fast": fast}
+    if path is not None:
+        # サーバーはカレントディレクトリが異なるため絶対パスで渡す
+        request["path"] = str(Path(path).resolve())
+
+    response = request_transcription(request, socket_path, audio=audio if path is None else None)
+    if response is None:
+        return None
+    return TranscriptionResult(**response)
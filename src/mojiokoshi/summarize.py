@@ -2,14 +2,22 @@
 2段階処理: (1) テキスト校正 → (2) 議事録生成 を行う。"""
 
 import argparse
-import json
+import atexit
+import bisect
+import hashlib
+import http.client
 import logging
 import os
+import re
 import sys
-import urllib.request
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, ValidationError
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +26,47 @@ OLLAMA_API = os.environ.get("OLLAMA_API_URL", "http://localhost:11434/api/chat")
 # チャンク分割設定
 CHUNK_SIZE = 4000  # 1チャンクあたりの文字数
 CONTEXT_SIZE = 300  # 前チャンクから引き継ぐ文脈の文字数（出力には含めない）
+SENTENCE_END_PATTERN = re.compile(r"[。！？!?\n]")  # チャンクの区切りに使う文末記号
+
+# 思考モデル（qwen3等）が本文に含めることがある思考過程
+THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
+# 校正では思考させない。思考過程の生成はデコード時間を使い、num_predictの上限も消費して本文が打ち切られる
+# （思考を無効化できないモデルやOllamaのバージョンに備え、THINK_PATTERNでの除去も残す）
+CORRECTION_THINK = False
 
 # LLM生成設定
 MAX_PREDICT_TOKENS = 8192
+# 校正の出力は入力とほぼ同じ長さなので、上限を入力文字数に合わせて絞る
+CORRECTION_MIN_PREDICT_TOKENS = 512
+CORRECTION_MAX_PREDICT_TOKENS = 6000
+
+# モデルをメモリに保持する時間。チャンク間の保持にはOllamaの既定（5分）で足りるため、
+# 未設定なら送らない。シェルでOLLAMA_KEEP_ALIVEをexportした場合のみ各リクエストで指定する
+# （ロード中のモデルはシステムプロンプト部分のKVキャッシュを再実行時にも再利用できる）
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE")
+
+DEFAULT_PARALLEL_REQUESTS = 4
+
+
+def _parallel_requests_from_env() -> int:
+    """OLLAMA_NUM_PARALLELを同時実行数として読む。未設定・整数でない・0以下
+    （Ollamaでは0は自動設定の意味）の場合はDEFAULT_PARALLEL_REQUESTSを使う。"""
+    try:
+        value = int(os.environ.get("OLLAMA_NUM_PARALLEL", ""))
+    except ValueError:
+        return DEFAULT_PARALLEL_REQUESTS
+    return value if value > 0 else DEFAULT_PARALLEL_REQUESTS
+
 
+# 校正・要約リクエストの同時実行数。サーバーと同じOLLAMA_NUM_PARALLELが設定されていれば合わせる
+# （超える分はOllama側で待たされるだけなので、サーバーの並列数と揃えるのがよい）
+PARALLEL_REQUESTS = _parallel_requests_from_env()
 
-class CorrectedChunk(BaseModel):
-    """校正済みテキストのスキーマ"""
-    corrected_text: str
+# 校正結果のキャッシュ保存先。同じ入力の校正はtemperature 0で同じ結果になるため、再実行時はLLMを呼ばない
+CORRECTION_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "mojiokoshi" / "correction"
+
+# 議事録生成を1回で行う校正済みテキストの最大文字数（超える場合は区間ごとに要約して統合する）
+SUMMARY_SECTION_SIZE = 16000
 
 
 class MeetingNotes(BaseModel):
@@ -38,6 +79,10 @@ class MeetingNotes(BaseModel):
     notable_quotes: list[str]  # 印象的な発言
 
 
+# 構造化出力でOllamaに渡す議事録のJSONスキーマ（変わらないためインポート時に一度だけ生成する。変更しないこと）
+_MEETING_NOTES_SCHEMA = MeetingNotes.model_json_schema()
+
+
 CORRECTION_PROMPT = """あなたは日本語校正AIです。
 
 【タスク】
@@ -54,7 +99,8 @@ CORRECTION_PROMPT = """あなたは日本語校正AIです。
 
 【重要】
 - 内容を要約せず、修正対象の全文を出力すること
-- 前の文脈は出力に含めないこと"""
+- 前の文脈は出力に含めないこと
+- 修正後のテキストのみを出力し、前置きや説明は書かないこと"""
 
 
 SUMMARY_PROMPT = """あなたは議事録作成AIです。修正済みの文字起こしテキストから詳細な要約をJSON形式で生成してください。
@@ -72,127 +118,392 @@ SUMMARY_PROMPT = """あなたは議事録作成AIです。修正済みの文字
 - 具体的な固有名詞、数字、エピソードを積極的に含める"""
 
 
+MERGE_PROMPT = """あなたは議事録作成AIです。1つの会議を区間ごとに要約した部分議事録（JSON）が時系列順に与えられます。
+これらを統合し、会議全体の議事録を同じJSON形式で生成してください。
+
+【統合ルール】
+1. summary: 会議全体を3-5文で詳細に要約。区間ごとの要約を並べるのではなく、全体の流れとしてまとめる
+2. key_points: 重複をまとめた上で、全体の主なポイントを5-8個
+3. discussion_topics: 全体で議論されたトピックやテーマを3-5個
+4. decisions / action_items: 各区間のものを重複なく全て含める（なければ空リスト）
+5. notable_quotes: 全体から印象的な発言を2-4個（「」で囲んで引用）
+
+【注意】
+- 部分議事録にない内容を追加しない
+- 具体的な固有名詞、数字、エピソードはできるだけ残す"""
+
+
+def _find_sentence_ends(text: str) -> list[int]:
+    """文末記号の直後の位置を昇順で返す（正規表現で一度だけ走査する）"""
+    return [m.end() for m in SENTENCE_END_PATTERN.finditer(text)]
+
+
 def split_into_chunks_with_context(
     text: str,
     chunk_size: int = CHUNK_SIZE,
     context_size: int = CONTEXT_SIZE,
-) -> list[tuple[str, str]]:
+) -> Iterator[tuple[str, str]]:
     """テキストをチャンクに分割する。前チャンクの末尾を文脈として付与し、
-    LLMがチャンク境界でも文脈を理解できるようにする。"""
-    chunks = []
+    LLMがチャンク境界でも文脈を理解できるようにする。
+    チャンクは可能な限り文末で区切り、文の途中で切れないようにする。
+    区切り位置は整数計算で求め、各チャンクの文字列は取り出されるまで作らない。"""
+    sentence_ends = _find_sentence_ends(text)
+
     start = 0
     text_len = len(text)
 
     while start < text_len:
         end = min(start + chunk_size, text_len)
 
-        # Get context from before this chunk (if not first chunk)
-        if start > 0:
-            context_start = max(0, start - context_size)
-            context = text[context_start:start]
-        else:
-            context = ""
+        # 上限以内で最後の文末を探し、チャンクの後半にあればそこで区切る
+        if end < text_len:
+            i = bisect.bisect_right(sentence_ends, end) - 1
+            if i >= 0 and sentence_ends[i] > start + chunk_size // 2:
+                end = sentence_ends[i]
 
-        main_text = text[start:end]
-        chunks.append((context, main_text))
+        # 最初のチャンク以外は直前の末尾を文脈として付ける
+        context_start = max(0, start - context_size)
+        yield text[context_start:start], text[start:end]
 
         start = end
 
-    return chunks
-
 
 MAX_RETRIES = 2
 
 
-def call_ollama(messages: list, model: str, schema: type[BaseModel] | None = None, timeout: int = 300) -> str:
-    """Ollama APIを呼び出す。一時的エラー時はリトライする。"""
+def call_ollama(
+    messages: list,
+    model: str,
+    schema: dict | None = None,
+    timeout: int = 300,
+    num_predict: int = MAX_PREDICT_TOKENS,
+    think: bool | None = None,
+) -> str:
+    """Ollama APIをストリーミングで呼び出し、応答を逐次連結して返す。
+    一時的エラー時はリトライする。thinkを指定すると思考モデルの思考の有無を切り替える。"""
+    content, _ = _chat(messages, model, schema, timeout, num_predict, think)
+    return content
+
+
+def _chat(
+    messages: list,
+    model: str,
+    schema: dict | None = None,
+    timeout: int = 300,
+    num_predict: int = MAX_PREDICT_TOKENS,
+    think: bool | None = None,
+) -> tuple[str, str | None]:
+    """call_ollamaの本体。応答本文と終了理由（done_reason。num_predictで打ち切られた場合は"length"）を返す。"""
     payload = {
         "model": model,
         "messages": messages,
-        "stream": False,
+        "stream": True,
         "options": {
             "temperature": 0,
-            "num_predict": MAX_PREDICT_TOKENS,
+            "num_predict": num_predict,
         },
     }
 
+    if KEEP_ALIVE:
+        payload["keep_alive"] = KEEP_ALIVE
     if schema:
-        payload["format"] = schema.model_json_schema()
+        payload["format"] = schema
+    if think is not None:
+        payload["think"] = think
+
+    # orjsonは日本語を\uXXXXにエスケープせずUTF-8のまま出力するため送信量も少ない
+    body = orjson.dumps(payload)
 
     last_error: Exception | None = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            req = urllib.request.Request(
-                OLLAMA_API,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-            )
-
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                result = json.loads(response.read().decode("utf-8"))
-                content = result.get("message", {}).get("content", "")
-                if not content:
-                    raise ValueError("Ollama API returned empty response content")
-                return content
-        except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as e:
+            response = _post(body, timeout)
+            if response.status != 200:
+                raise http.client.HTTPException(
+                    f"Ollama API returned HTTP {response.status}: {response.read().decode('utf-8', 'replace')}"
+                )
+            content, done_reason = _read_stream(response)
+            if not content:
+                raise ValueError("Ollama API returned empty response content")
+        except (OSError, http.client.HTTPException, orjson.JSONDecodeError) as e:
+            # 応答の途中で失敗した接続は再利用できないので閉じる
+            _close_connection()
             last_error = e
             if attempt < MAX_RETRIES:
                 logger.warning("Ollama API call failed (attempt %d/%d): %s", attempt, MAX_RETRIES, e)
                 continue
             raise
+        except ValueError:
+            _close_connection()
+            raise
+
+        # 応答を読み切った接続は他のスレッドや次の段階でも使えるようプールに戻す
+        _release_connection()
+        return content, done_reason
 
     raise last_error  # unreachable, but satisfies type checker
 
 
-def correct_chunk(context: str, main_text: str, model: str) -> str:
-    """1チャンク分のテキストをLLMで校正する"""
+# Ollamaへのkeep-alive接続。呼び出し中はスレッドが専有し、終わったら共有のプールに戻す
+# （並列校正のワーカーや段階ごとに作り直されるスレッドの間でも接続を使い回す）
+_local = threading.local()
+_idle_connections: list[http.client.HTTPConnection] = []
+_pool_lock = threading.Lock()
+
+
+def _connection() -> http.client.HTTPConnection:
+    """現在のスレッドのOllama接続を返す。未取得ならプールから取り出すか新しく作成する。"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        with _pool_lock:
+            conn = _idle_connections.pop() if _idle_connections else None
+        if conn is None:
+            url = urllib.parse.urlsplit(OLLAMA_API)
+            if url.scheme == "https":
+                conn = http.client.HTTPSConnection(url.hostname, url.port)
+            else:
+                conn = http.client.HTTPConnection(url.hostname, url.port)
+        _local.conn = conn
+    return conn
+
+
+def _release_connection() -> None:
+    """現在のスレッドのOllama接続をプールに戻す"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        with _pool_lock:
+            _idle_connections.append(conn)
+
+
+def _close_connection() -> None:
+    """現在のスレッドのOllama接続を閉じ、次回の呼び出しで張り直させる"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def close_connections() -> None:
+    """現在のスレッドの接続とプール中のアイドル接続をすべて閉じる。
+    プロセス終了時にも呼ばれ、Ollama側に半開きのソケットを残さない。"""
+    _close_connection()
+    with _pool_lock:
+        idle = list(_idle_connections)
+        _idle_connections.clear()
+    for conn in idle:
+        conn.close()
+
+
+atexit.register(close_connections)
+
+
+def _post(body: bytes, timeout: float) -> http.client.HTTPResponse:
+    """keep-alive接続でOllama APIにPOSTする。
+    アイドル中にサーバー側で閉じられた接続だった場合は1度だけ張り直して再送する。"""
+    conn = _connection()
+    conn.timeout = timeout
+    reused = conn.sock is not None
+    if reused:
+        conn.sock.settimeout(timeout)
+
+    path = urllib.parse.urlsplit(OLLAMA_API).path
+    headers = {"Content-Type": "application/json"}
+    try:
+        conn.request("POST", path, body=body, headers=headers)
+        return conn.getresponse()
+    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+        conn.close()
+        if not reused:
+            raise
+        conn.request("POST", path, body=body, headers=headers)
+        return conn.getresponse()
+
+
+def _read_stream(response) -> tuple[str, str | None]:
+    """改行区切りJSON（NDJSON）のストリーミング応答からメッセージ本文と終了理由を組み立てる。
+    接続を再利用できるよう、応答は終端まで読み切る。"""
+    parts = []
+    done_reason = None
+    for line in response:
+        if not line.strip():
+            continue
+        chunk = orjson.loads(line)
+        if "error" in chunk:
+            raise ValueError(f"Ollama API error: {chunk['error']}")
+        parts.append(chunk.get("message", {}).get("content", ""))
+        if chunk.get("done"):
+            # 最終行の統計（キャッシュ済みのプロンプトはprompt_eval_countに含まれない）
+            logger.debug(
+                "Ollama response: %s prompt tokens evaluated, %s tokens generated",
+                chunk.get("prompt_eval_count"), chunk.get("eval_count"),
+            )
+            done_reason = chunk.get("done_reason")
+            if done_reason == "length":
+                logger.warning("Ollama response truncated at num_predict limit")
+    return "".join(parts), done_reason
+
+
+def correct_chunk(context: str, main_text: str, model: str) -> tuple[str, bool]:
+    """1チャンク分のテキストをLLMで校正する。
+    校正結果と、それが完全な校正結果か（出力の打ち切りや原文へのフォールバックでないか）を返す。"""
     if context:
         user_content = f"===前の文脈===\n{context}\n\n===修正対象===\n{main_text}"
     else:
         user_content = f"===修正対象===\n{main_text}"
 
+    # 固定のシステムプロンプトを先頭に置き、チャンクごとに変わる部分はユーザーメッセージに限る
+    # （全チャンクでプロンプトの先頭が一致し、OllamaがそのKVキャッシュを再利用できる）
     messages = [
         {"role": "system", "content": CORRECTION_PROMPT},
         {"role": "user", "content": user_content},
     ]
 
-    content = call_ollama(messages, model, schema=CorrectedChunk)
-    data = json.loads(content)
-    corrected = data.get("corrected_text")
-    if corrected is None:
-        logger.warning("LLM response missing 'corrected_text' key, using original text")
-        return main_text
-    return corrected
+    # 1フィールドだけのJSONで包む意味はないため、構造化出力を使わず本文をそのまま受け取る
+    content, done_reason = _chat(
+        messages, model, num_predict=_correction_num_predict(main_text), think=CORRECTION_THINK
+    )
+    corrected = THINK_PATTERN.sub("", content).strip()
+    if not corrected:
+        logger.warning("LLM returned no corrected text, using original text")
+        return main_text, False
+    return corrected, done_reason != "length"
+
+
+def _correction_num_predict(main_text: str) -> int:
+    """1チャンク分の校正の出力トークン上限を返す"""
+    return min(
+        max(len(main_text) * 2, CORRECTION_MIN_PREDICT_TOKENS),
+        CORRECTION_MAX_PREDICT_TOKENS,
+    )
 
 
-def correct_full_transcript(text: str, model: str) -> str:
-    """全文をチャンクに分割して順番に校正する"""
-    chunks = split_into_chunks_with_context(text)
+def correct_full_transcript(
+    text: str,
+    model: str,
+    parallel: int = PARALLEL_REQUESTS,
+    cache_dir: Path | None = None,
+) -> str:
+    """全文をチャンクに分割し、最大parallel件ずつ並行して校正する（結果の順序は保持）。
+    cache_dirを指定すると、校正済みのチャンクはキャッシュから読み出してLLMを呼ばない。
+    キャッシュの読み書きに失敗しても警告を出すだけで、校正そのものは続ける。"""
+    # 進捗表示に総数が必要で、executor.mapも全件を先に投入するためここでリスト化する
+    chunks = list(split_into_chunks_with_context(text))
     total_chunks = len(chunks)
 
-    logger.info("Correcting %d chunks...", total_chunks)
+    logger.info("Correcting %d chunks (parallel: %d)...", total_chunks, parallel)
+
+    def correct(index: int, chunk: tuple[str, str]) -> str:
+        context, main_text = chunk
+        cache_path = _correction_cache_path(cache_dir, context, main_text, model) if cache_dir else None
+        if cache_path is not None:
+            try:
+                corrected = cache_path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                pass
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning("Failed to read correction cache %s: %s", cache_path, e)
+            else:
+                logger.info("Chunk %d/%d loaded from cache", index + 1, total_chunks)
+                return corrected
+
+        logger.info("Processing chunk %d/%d...", index + 1, total_chunks)
+        corrected, complete = correct_chunk(context, main_text, model)
+        # 打ち切られた出力や原文へのフォールバックは、次回の実行で校正し直せるようキャッシュしない
+        if cache_path is not None and complete:
+            _write_correction_cache(cache_path, corrected)
+        logger.info("Chunk %d/%d done", index + 1, total_chunks)
+        return corrected
+
+    max_workers = max(1, min(parallel, total_chunks))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        corrected_parts = list(executor.map(correct, range(total_chunks), chunks))
+
+    return "\n\n".join(corrected_parts)
 
-    corrected_parts = []
 
-    for i, (context, main_text) in enumerate(chunks):
-        logger.info("Processing chunk %d/%d...", i + 1, total_chunks)
-        corrected = correct_chunk(context, main_text, model)
-        corrected_parts.append(corrected)
-        logger.info("Chunk %d/%d done", i + 1, total_chunks)
+def _correction_cache_path(cache_dir: Path, context: str, main_text: str, model: str) -> Path:
+    """校正の入力一式（モデル・生成設定・プロンプト・文脈・本文）のSHA-256をファイル名にしたキャッシュのパスを返す"""
+    key = orjson.dumps(
+        {
+            "model": model,
+            "num_predict": _correction_num_predict(main_text),
+            "think": CORRECTION_THINK,
+            "prompt": CORRECTION_PROMPT,
+            "context": context,
+            "text": main_text,
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return cache_dir / f"{hashlib.sha256(key).hexdigest()}.txt"
 
-    return "\n\n".join(corrected_parts)
 
+def _write_correction_cache(path: Path, text: str) -> None:
+    """校正結果をキャッシュに書き込む。中断されても壊れたファイルが残らないよう一時ファイルから置き換える。
+    キャッシュは補助的なものなので、書き込めなくても警告だけで処理を続ける。"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Failed to write correction cache %s: %s", path, e)
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def summarize_corrected_text(
+    corrected_text: str,
+    model: str,
+    parallel: int = PARALLEL_REQUESTS,
+) -> MeetingNotes:
+    """校正済みテキストから構造化された議事録を生成する。
+    長いテキストは区間ごとの部分議事録を並行して生成し、最後に統合する（map-reduce）。"""
+    if len(corrected_text) <= SUMMARY_SECTION_SIZE:
+        return summarize_section(corrected_text, model)
+
+    sections = [
+        main_text
+        for _, main_text in split_into_chunks_with_context(corrected_text, SUMMARY_SECTION_SIZE, 0)
+    ]
+    total_sections = len(sections)
+    logger.info("Summarizing %d sections (parallel: %d)...", total_sections, parallel)
 
-def summarize_corrected_text(corrected_text: str, model: str) -> MeetingNotes:
-    """校正済みテキストから構造化された議事録を生成する"""
+    max_workers = max(1, min(parallel, total_sections))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        partial_notes = list(executor.map(lambda section: summarize_section(section, model), sections))
+
+    logger.info("Merging %d partial summaries...", total_sections)
+    return merge_meeting_notes(partial_notes, model)
+
+
+def summarize_section(text: str, model: str) -> MeetingNotes:
+    """1区間分の校正済みテキストから議事録を生成する"""
     messages = [
         {"role": "system", "content": SUMMARY_PROMPT},
-        {"role": "user", "content": f"以下の修正済み文字起こしから詳細な議事録を作成してください：\n\n{corrected_text}"},
+        {"role": "user", "content": f"以下の修正済み文字起こしから詳細な議事録を作成してください：\n\n{text}"},
     ]
 
-    content = call_ollama(messages, model, schema=MeetingNotes, timeout=600)
-    data = json.loads(content)
-    return MeetingNotes(**data)
+    content = call_ollama(messages, model, schema=_MEETING_NOTES_SCHEMA, timeout=600)
+    # JSONの解析と検証をpydantic-coreで一度に行い、中間のdictを作らない
+    return MeetingNotes.model_validate_json(content)
+
+
+def merge_meeting_notes(partial_notes: list[MeetingNotes], model: str) -> MeetingNotes:
+    """区間ごとの部分議事録を1つの議事録に統合する"""
+    sections = "\n\n".join(
+        f"===区間{i}/{len(partial_notes)}===\n{notes.model_dump_json()}"
+        for i, notes in enumerate(partial_notes, 1)
+    )
+    messages = [
+        {"role": "system", "content": MERGE_PROMPT},
+        {"role": "user", "content": f"以下の部分議事録を統合してください：\n\n{sections}"},
+    ]
+
+    content = call_ollama(messages, model, schema=_MEETING_NOTES_SCHEMA, timeout=600)
+    return MeetingNotes.model_validate_json(content)
 
 
 def to_markdown(notes: MeetingNotes, corrected_transcript: str) -> str:
@@ -234,6 +545,8 @@ def summarize(
     text: str,
     model: str = "qwen3:14b",
     correction_model: str | None = None,
+    parallel: int = PARALLEL_REQUESTS,
+    cache_dir: Path | None = None,
 ) -> str:
     """2段階処理で文字起こしテキストを要約する。
     Stage1: 高速モデルでテキスト校正 → Stage2: 高品質モデルで議事録生成"""
@@ -241,11 +554,11 @@ def summarize(
 
     # Stage 1: テキスト校正（高速モデルで実行）
     logger.info("Stage 1: Correcting transcript (model: %s)...", correction_model)
-    corrected_text = correct_full_transcript(text, correction_model)
+    corrected_text = correct_full_transcript(text, correction_model, parallel, cache_dir)
 
     # Stage 2: 議事録生成（高品質モデルで実行）
     logger.info("Stage 2: Generating detailed summary (model: %s)...", model)
-    notes = summarize_corrected_text(corrected_text, model)
+    notes = summarize_corrected_text(corrected_text, model, parallel)
 
     return to_markdown(notes, corrected_text)
 
@@ -265,6 +578,17 @@ def main() -> None:
         default="qwen3:8b",
         help="Model for text correction, faster (default: qwen3:8b)",
     )
+    parser.add_argument(
+        "-p", "--parallel",
+        type=int,
+        default=PARALLEL_REQUESTS,
+        help=f"Concurrent correction requests, match OLLAMA_NUM_PARALLEL (default: {PARALLEL_REQUESTS})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always re-run correction instead of reusing cached chunks in {CORRECTION_CACHE_DIR}",
+    )
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -283,12 +607,13 @@ def main() -> None:
     print(f"Input length: {len(text)} characters\n")
 
     try:
-        result = summarize(text, args.model, args.correction_model)
-    except urllib.error.URLError as e:
+        cache_dir = None if args.no_cache else CORRECTION_CACHE_DIR
+        result = summarize(text, args.model, args.correction_model, args.parallel, cache_dir)
+    except OSError as e:
         print(f"Error: Ollama server not running? {e}", file=sys.stderr)
         print("Start with: ollama serve", file=sys.stderr)
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except (orjson.JSONDecodeError, ValidationError) as e:
         print(f"Error: Failed to parse JSON response: {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
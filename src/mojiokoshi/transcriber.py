@@ -1,11 +1,20 @@
 """Whisper transcription engine using mlx-whisper."""
 
+import itertools
 import logging
+import subprocess
+import tempfile
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Iterable, Iterator, Literal
 
+import mlx.core as mx
 import mlx_whisper
+import numpy as np
+from mlx_whisper.audio import N_FRAMES, N_SAMPLES, SAMPLE_RATE, log_mel_spectrogram, pad_or_trim
+from mlx_whisper.decoding import DecodingOptions, decode
+from mlx_whisper.transcribe import ModelHolder
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +30,76 @@ class TranscriptionResult:
 # 利用可能なWhisperモデルサイズの型定義
 ModelSize = Literal["tiny", "base", "small", "medium", "large-v3"]
 
+# 無音区間のハルシネーションを除外する閾値（mlx_whisper.transcribeの既定値と同じ）
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+# 高速モードのデコード設定。温度フォールバックによる再デコードと前区間の文脈の引き継ぎを行わない
+# （mlx-whisperはビームサーチ未対応のため、既定でも貪欲デコードになる）
+FAST_DECODE_OPTIONS = {"temperature": 0.0, "condition_on_previous_text": False}
+
+# 長い音声ファイルのストリーミング設定（高速モードのみ）
+LONG_AUDIO_SEC = 10 * 60  # 高速モードでは、これより長い音声を一括で読み込まず窓ごとにまとめてデコードする
+STREAM_WINDOW_SEC = 24  # 1窓の最大長（早口でも1回のデコードの出力トークン上限に収まる長さ）
+STREAM_CUT_SEARCH_SEC = 8  # 窓の末尾からこの範囲で最も静かな位置を区切りにする
+STREAM_BATCH_SIZE = 8  # 1回のデコードでまとめて処理する窓の数
+CUT_FRAME_SAMPLES = 1600  # 区切り位置を探す際の音量計算の単位（0.1秒）
+
+
+def iter_audio_windows(
+    audio_path: Path | str,
+    window_sec: float = STREAM_WINDOW_SEC,
+    search_sec: float = STREAM_CUT_SEARCH_SEC,
+) -> Iterator[np.ndarray]:
+    """ffmpegでデコードした16kHzモノラル音声を、全体を読み込まずに窓単位で順に返す。
+    窓の末尾付近で最も音量の小さい位置で区切り、発話の途中で切れにくくする。"""
+    window = int(window_sec * SAMPLE_RATE)
+    search = int(search_sec * SAMPLE_RATE)
+    # mlx_whisper.audio.load_audioと同じ変換をパイプで逐次読み出す
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0", "-i", str(audio_path),
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-",
+    ]
+    # stderrをパイプにすると、エラー出力が多い時（破損したmp3のフレームごとの警告等）に
+    # ffmpegが書き込みで止まりstdoutも終端に達しなくなるため、一時ファイルに書かせて最後に読む
+    stderr = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+    pending = np.empty(0, dtype=np.float32)
+    try:
+        while True:
+            data = proc.stdout.read((window - len(pending)) * 2)
+            samples = np.frombuffer(data[:len(data) // 2 * 2], dtype=np.int16)
+            pending = np.concatenate([pending, samples.astype(np.float32) / 32768.0])
+            if len(pending) < window:
+                # 窓に満たないまま読み切った
+                break
+            cut = _quietest_cut(pending, search)
+            yield pending[:cut]
+            pending = pending[cut:]
+
+        if proc.wait() != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"Failed to load audio: {stderr.read().decode(errors='replace')}")
+        if len(pending):
+            yield pending
+    finally:
+        # 途中で読むのをやめた場合もffmpegを残さない
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        stderr.close()
+
+
+def _quietest_cut(audio: np.ndarray, search: int) -> int:
+    """音声末尾のsearchサンプルの中で、平均振幅が最も小さい0.1秒区間の中央の位置を返す。
+    同じ音量の区間が複数あれば、窓が長くなるよう最も後ろの区間を選ぶ。"""
+    n_frames = search // CUT_FRAME_SAMPLES
+    start = len(audio) - n_frames * CUT_FRAME_SAMPLES
+    energy = np.abs(audio[start:].reshape(n_frames, CUT_FRAME_SAMPLES)).mean(axis=1)
+    quietest = n_frames - 1 - int(np.argmin(energy[::-1]))
+    return start + quietest * CUT_FRAME_SAMPLES + CUT_FRAME_SAMPLES // 2
+
 
 class WhisperTranscriber:
     """Apple Silicon向けmlx-whisperを用いた文字起こしエンジン"""
@@ -38,29 +117,142 @@ class WhisperTranscriber:
         self,
         model_name: ModelSize = "large-v3",
         language: str = "ja",
+        fast: bool = False,
     ):
         self.model_path = self.MODELS[model_name]
         self.language = language
         self.model_name = model_name
+        # 精度よりも速度を優先する（リアルタイム文字起こしと、file --fastの長い音声のバッチデコード用）
+        self.fast = fast
+
+    @cached_property
+    def model(self):
+        """Whisperモデル。生成時には読み込まず、初めて使う時にロードする
+        （mlx-whisperのModelHolderが保持するモデルを共有する）。"""
+        return ModelHolder.get_model(self.model_path, mx.float16)
+
+    def _decode_options(self) -> dict[str, Any]:
+        """mlx_whisper.transcribeに追加で渡すデコード設定を返す"""
+        return FAST_DECODE_OPTIONS if self.fast else {}
 
     def transcribe(self, audio_path: Path | str) -> TranscriptionResult:
-        """音声ファイルをテキストに変換する"""
+        """音声ファイルをテキストに変換する。
+        高速モードでは、LONG_AUDIO_SEC を超える長い音声を窓ごとに読み込み、まとめてバッチでデコードする。
+        バッチデコードは温度フォールバック・繰り返しの検出・前区間の文脈の引き継ぎ・セグメントの時刻推定を
+        行わないため、通常モードでは長さによらずファイルをそのままmlx_whisper.transcribeに渡す。"""
         audio_path_str = str(audio_path)
 
         if not Path(audio_path_str).exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path_str}")
 
         try:
-            result = mlx_whisper.transcribe(
-                audio_path_str,
-                path_or_hf_repo=self.model_path,
-                language=self.language,
-                word_timestamps=False,
-            )
+            if not self.fast:
+                return self._transcribe_mlx(audio_path_str)
+
+            windows = iter_audio_windows(audio_path_str)
+            # 先頭から読み進め、長さの上限に達しなければ通常どおり全体をまとめて文字起こしする
+            head: list[np.ndarray] = []
+            head_samples = 0
+            for window in windows:
+                head.append(window)
+                head_samples += len(window)
+                if head_samples > LONG_AUDIO_SEC * SAMPLE_RATE:
+                    return self._transcribe_windows(itertools.chain(head, windows))
+            if not head:
+                return TranscriptionResult(text="", segments=[], language=self.language)
+            return self.transcribe_array(np.concatenate(head))
         except Exception as e:
             logger.error("Failed to transcribe %s: %s", audio_path_str, e)
             raise RuntimeError(f"Transcription failed for {audio_path_str}") from e
 
+    def _transcribe_windows(
+        self,
+        windows: Iterable[np.ndarray],
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> TranscriptionResult:
+        """音声の窓をbatch_size個ずつまとめて文字起こしし、窓の位置をセグメントの時刻にする"""
+        windows = iter(windows)
+        texts: list[str] = []
+        segments: list[dict[str, Any]] = []
+        offset = 0.0
+        while batch := list(itertools.islice(windows, batch_size)):
+            for audio, result in zip(batch, self.transcribe_batch(batch)):
+                duration = len(audio) / SAMPLE_RATE
+                if result.text:
+                    texts.append(result.text)
+                    segments.append({"start": offset, "end": offset + duration, "text": result.text})
+                offset += duration
+
+        return TranscriptionResult(text="\n".join(texts), segments=segments, language=self.language)
+
+    def transcribe_batch(self, audios: list[np.ndarray]) -> list[TranscriptionResult]:
+        """複数の短い音声（16kHz float32）をまとめて1回のエンコード/デコードで文字起こしする。
+        30秒を超える音声はバッチに含められないため個別に文字起こしする。
+        出力トークンの上限で打ち切られた音声も、末尾が欠けないよう個別に文字起こしし直す。"""
+        results: list[TranscriptionResult | None] = [None] * len(audios)
+        batch_indices = [i for i, audio in enumerate(audios) if len(audio) <= N_SAMPLES]
+
+        for i, audio in enumerate(audios):
+            if len(audio) > N_SAMPLES:
+                results[i] = self.transcribe_array(audio)
+
+        if batch_indices:
+            try:
+                model = self.model
+                # transcribe()と同様に無音でパディングしてから30秒分のメルフレームに揃える
+                mel = mx.stack([
+                    pad_or_trim(
+                        log_mel_spectrogram(audios[i], n_mels=model.dims.n_mels, padding=N_SAMPLES),
+                        N_FRAMES,
+                        axis=-2,
+                    )
+                    for i in batch_indices
+                ]).astype(mx.float16)
+                # 1回のデコードで生成できるトークン数の上限（DecodingOptionsの既定値と同じ）
+                sample_len = model.dims.n_text_ctx // 2
+                options = DecodingOptions(
+                    language=self.language, without_timestamps=True, fp16=True, sample_len=sample_len
+                )
+                decoded = decode(model, mel, options)
+            except Exception as e:
+                logger.error("Failed to transcribe batch of %d: %s", len(batch_indices), e)
+                raise RuntimeError("Batch transcription failed") from e
+
+            for i, d in zip(batch_indices, decoded):
+                if len(d.tokens) >= sample_len:
+                    # タイムスタンプなしのデコードは上限で黙って止まるため、
+                    # 区間を進めながらデコードする通常の文字起こしでやり直す
+                    logger.info("Batch decode hit the token limit, transcribing item %d again", i)
+                    results[i] = self.transcribe_array(audios[i])
+                    continue
+                is_silence = d.no_speech_prob > NO_SPEECH_THRESHOLD and d.avg_logprob < LOGPROB_THRESHOLD
+                text = "" if is_silence else d.text.strip()
+                duration = len(audios[i]) / SAMPLE_RATE
+                results[i] = TranscriptionResult(
+                    text=text,
+                    segments=[{"start": 0.0, "end": duration, "text": text}] if text else [],
+                    language=d.language,
+                )
+
+        return results
+
+    def transcribe_array(self, audio: np.ndarray) -> TranscriptionResult:
+        """16kHzのfloat32音声配列を一時ファイルを介さずにテキストに変換する"""
+        try:
+            return self._transcribe_mlx(audio.astype(np.float32, copy=False))
+        except Exception as e:
+            logger.error("Failed to transcribe %d samples: %s", len(audio), e)
+            raise RuntimeError("Transcription failed for audio array") from e
+
+    def _transcribe_mlx(self, audio: np.ndarray | str) -> TranscriptionResult:
+        """mlx_whisper.transcribeで音声ファイルのパスまたは音声配列を文字起こしする"""
+        result = mlx_whisper.transcribe(
+            audio,
+            path_or_hf_repo=self.model_path,
+            language=self.language,
+            word_timestamps=False,
+            **self._decode_options(),
+        )
         return TranscriptionResult(
             text=result["text"].strip(),
             segments=result.get("segments", []),
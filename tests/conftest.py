@@ -0,0 +1,11 @@
+"""Shared fixtures for mojiokoshi tests."""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def sine_1s_16k() -> np.ndarray:
+    """1 second of a 440 Hz sine at 16 kHz (float32), computed once per test module."""
+    t = np.arange(16000, dtype=np.float32) * np.float32(1.0 / 16000.0)
+    return np.sin(np.float32(2 * np.pi * 440.0) * t, dtype=np.float32)
@@ -56,6 +56,21 @@ class TestCLI:
         mock_rt_class.assert_called_once()
         mock_rt_instance.start.assert_called_once()
 
+    @patch("mojiokoshi.cli.WhisperTranscriber")
+    @patch("mojiokoshi.cli.transcribe_via_server")
+    def test_file_command_uses_running_server(self, mock_via_server, mock_trans_class, tmp_path):
+        """Test file command skips in-process model loading when the server answers."""
+        audio_file = tmp_path / "audio.wav"
+        audio_file.write_bytes(b"")
+        mock_via_server.return_value = MagicMock(text="サーバー結果")
+
+        with patch("sys.argv", ["mojiokoshi", "file", str(audio_file)]):
+            main()
+
+        mock_via_server.assert_called_once_with("large-v3", "ja", path=audio_file, fast=False)
+        mock_trans_class.assert_not_called()
+        assert audio_file.with_suffix(".txt").read_text(encoding="utf-8") == "サーバー結果"
+
 
 class TestCLIArguments:
     """Tests for CLI argument parsing."""
@@ -80,7 +95,8 @@ class TestCLIArguments:
             # argparse exits with 2 for invalid arguments
             assert exc_info.value.code == 2
 
-    def test_record_duration_option(self):
+    @patch("mojiokoshi.cli.transcribe_via_server", return_value=None)
+    def test_record_duration_option(self, mock_via_server):
         """Test record command accepts duration option."""
         import numpy as np
         with patch("sys.argv", ["mojiokoshi", "record", "-d", "5"]):
@@ -91,7 +107,7 @@ class TestCLIArguments:
                     mock_rec.return_value = mock_instance
 
                     mock_trans_instance = MagicMock()
-                    mock_trans_instance.transcribe.return_value = MagicMock(text="test")
+                    mock_trans_instance.transcribe_array.return_value = MagicMock(text="test")
                     mock_trans.return_value = mock_trans_instance
 
                     # Should complete without error (argument parsing works)
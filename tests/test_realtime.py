@@ -21,7 +21,7 @@ class TestRealtimeTranscriber:
         assert rt.silence_duration == 1.5
         assert rt.min_audio_length == 1.0
         mock_recorder_cls.assert_called_once_with(device=None)
-        mock_transcriber_cls.assert_called_once_with(model_name="large-v3", language="ja")
+        mock_transcriber_cls.assert_called_once_with(model_name="large-v3", language="ja", fast=True)
 
     @patch("mojiokoshi.realtime.WhisperTranscriber")
     @patch("mojiokoshi.realtime.MicrophoneRecorder")
@@ -45,7 +45,7 @@ class TestRealtimeTranscriber:
         rt = RealtimeTranscriber(silence_threshold=0.5)
         silent_chunk = np.zeros(100, dtype=np.float32)
         rt._process_chunk(silent_chunk)
-        assert len(rt._buffer) == 0
+        assert rt._buffer_len == 0
 
     @patch("mojiokoshi.realtime.WhisperTranscriber")
     @patch("mojiokoshi.realtime.MicrophoneRecorder")
@@ -54,7 +54,7 @@ class TestRealtimeTranscriber:
         rt = RealtimeTranscriber(silence_threshold=0.01)
         speech_chunk = np.ones(100, dtype=np.float32)
         rt._process_chunk(speech_chunk)
-        assert len(rt._buffer) == 1
+        assert rt._buffer_len == 100
         assert rt._is_speaking is True
 
     @patch("mojiokoshi.realtime.WhisperTranscriber")
@@ -64,3 +64,167 @@ class TestRealtimeTranscriber:
         rt = RealtimeTranscriber()
         assert isinstance(rt._stop_event, threading.Event)
         assert not rt._stop_event.is_set()
+
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_start_returns_when_stop_event_set(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that start() blocks until _stop_event is set, then stops."""
+        mock_recorder_cls.return_value.sample_rate = 16000
+        rt = RealtimeTranscriber()
+        recording_started = threading.Event()
+        mock_recorder_cls.return_value.start_recording.side_effect = (
+            lambda on_chunk: recording_started.set()
+        )
+
+        thread = threading.Thread(target=rt.start)
+        thread.start()
+        assert recording_started.wait(timeout=5)
+        assert thread.is_alive()
+
+        rt._stop_event.set()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        mock_recorder_cls.return_value.stop_recording.assert_called()
+
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_start_warms_up_with_short_array(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that warm-up passes a short silent array through the batch path without a temp file."""
+        mock_recorder_cls.return_value.sample_rate = 16000
+        rt = RealtimeTranscriber()
+        mock_recorder_cls.return_value.start_recording.side_effect = (
+            lambda on_chunk: rt._stop_event.set()
+        )
+
+        rt.start()
+
+        mock_transcriber_cls.return_value.transcribe.assert_not_called()
+        (batch,), _ = mock_transcriber_cls.return_value.transcribe_batch.call_args_list[0]
+        assert len(batch) == 1
+        assert batch[0].dtype == np.float32
+        assert len(batch[0]) == 1600
+        assert not batch[0].any()
+
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_transcribe_buffer_enqueues_utterance(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that a finished utterance is queued instead of transcribed inline."""
+        mock_recorder_cls.return_value.sample_rate = 16000
+        rt = RealtimeTranscriber(min_audio_length=0.0)
+        rt._process_chunk(np.ones(100, dtype=np.float32))
+
+        rt._transcribe_buffer()
+
+        assert rt._buffer_len == 0
+        assert rt._is_speaking is False
+        assert rt._queue.qsize() == 1
+        mock_transcriber_cls.return_value.transcribe_batch.assert_not_called()
+
+    @patch("mojiokoshi.realtime.BACKLOG_WARNING_SIZE", 1)
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_transcribe_buffer_warns_on_backlog(self, mock_recorder_cls, mock_transcriber_cls, caplog):
+        """Test that a growing backlog is reported without blocking the recording callback."""
+        mock_recorder_cls.return_value.sample_rate = 16000
+        rt = RealtimeTranscriber(min_audio_length=0.0)
+
+        for _ in range(2):
+            rt._process_chunk(np.ones(100, dtype=np.float32))
+            rt._transcribe_buffer()
+
+        assert rt._queue.qsize() == 2
+        assert "falling behind" in caplog.text
+
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_worker_batches_queued_utterances_in_order(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that queued utterances are transcribed in one batch and emitted in order."""
+        mock_transcriber_cls.return_value.transcribe_batch.side_effect = lambda batch: [
+            MagicMock(text=f"text{int(audio[0])}") for audio in batch
+        ]
+        received = []
+        rt = RealtimeTranscriber(on_transcription=received.append, batch_size=4)
+        for i in range(3):
+            rt._queue.put(np.full(10, i, dtype=np.float32))
+        rt._queue.put(None)
+
+        rt._transcription_worker()
+
+        mock_transcriber_cls.return_value.transcribe_batch.assert_called_once()
+        assert received == ["text0", "text1", "text2"]
+        assert rt.get_all_text() == "text0\ntext1\ntext2"
+
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_callback_error_does_not_stop_worker(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that a failing callback is logged and later utterances are still transcribed."""
+        mock_transcriber_cls.return_value.transcribe_batch.side_effect = lambda batch: [
+            MagicMock(text=f"text{int(audio[0])}") for audio in batch
+        ]
+        received = []
+
+        def on_text(text):
+            if text == "text0":
+                raise BrokenPipeError("stdout closed")
+            received.append(text)
+
+        rt = RealtimeTranscriber(on_transcription=on_text, batch_size=1)
+        for i in range(2):
+            rt._queue.put(np.full(10, i, dtype=np.float32))
+        rt._queue.put(None)
+
+        rt._transcription_worker()
+
+        assert received == ["text1"]
+        assert rt.get_all_text() == "text0\ntext1"
+
+    @patch("mojiokoshi.realtime.STOP_PROGRESS_INTERVAL_SEC", 0.01)
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_stop_waits_for_whole_backlog(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that stop() returns only after every queued utterance is transcribed."""
+        import time
+
+        def slow_batch(batch):
+            time.sleep(0.02)
+            return [MagicMock(text=f"text{int(audio[0])}") for audio in batch]
+
+        mock_transcriber_cls.return_value.transcribe_batch.side_effect = slow_batch
+        rt = RealtimeTranscriber(on_transcription=lambda text: None, batch_size=1)
+        rt._worker = threading.Thread(target=rt._transcription_worker, daemon=True)
+        for i in range(5):
+            rt._queue.put(np.full(10, i, dtype=np.float32))
+        rt._worker.start()
+
+        assert rt.stop() == "text0\ntext1\ntext2\ntext3\ntext4"
+
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_mean_amplitude_matches_abs_mean(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that the scratch-buffer amplitude equals np.abs(chunk).mean()."""
+        rt = RealtimeTranscriber()
+        chunk = np.array([0.5, -0.25, 0.0, -1.0], dtype=np.float32)
+
+        assert rt._mean_amplitude(chunk) == pytest.approx(np.abs(chunk).mean())
+        # Input chunk must not be modified in place
+        assert chunk[1] == np.float32(-0.25)
+        assert rt._mean_amplitude(np.empty(0, dtype=np.float32)) == 0.0
+
+    @patch("mojiokoshi.realtime.WhisperTranscriber")
+    @patch("mojiokoshi.realtime.MicrophoneRecorder")
+    def test_buffer_grows_and_preserves_order(self, mock_recorder_cls, mock_transcriber_cls):
+        """Test that chunks are copied contiguously and the buffer is reused."""
+        mock_recorder_cls.return_value.sample_rate = 16000
+        rt = RealtimeTranscriber(min_audio_length=0.0)
+        for i in range(5):
+            rt._process_chunk(np.full(100, i + 1, dtype=np.float32))
+
+        capacity = len(rt._buffer)
+        rt._transcribe_buffer()
+        audio = rt._queue.get_nowait()
+        np.testing.assert_array_equal(audio, np.repeat(np.arange(1, 6, dtype=np.float32), 100))
+
+        # The next utterance reuses the same storage
+        rt._process_chunk(np.ones(100, dtype=np.float32))
+        assert len(rt._buffer) == capacity
+        assert rt._buffer_len == 100
@@ -1,14 +1,23 @@
 """Tests for recorder module."""
 
+import struct
+import wave
+
 import numpy as np
 import pytest
 from unittest.mock import patch, MagicMock
-from mojiokoshi.recorder import MicrophoneRecorder
+from mojiokoshi.recorder import MicrophoneRecorder, _query_input_devices, float_to_int16
 
 
 class TestMicrophoneRecorder:
     """Tests for MicrophoneRecorder class."""
 
+    @pytest.fixture(autouse=True)
+    def clear_device_cache(self):
+        _query_input_devices.cache_clear()
+        yield
+        _query_input_devices.cache_clear()
+
     def test_init_defaults(self):
         """Test default initialization."""
         recorder = MicrophoneRecorder()
@@ -46,35 +55,131 @@ class TestMicrophoneRecorder:
         assert len(devices) == 2
         assert devices[0]["name"] == "Mic 1"
         assert devices[1]["name"] == "Mic 2"
+        assert devices[0]["default"] is True
+        assert devices[1]["default"] is False
+        # 既定デバイスの問い合わせはデバイス数によらず1回
+        assert mock_query.call_count == 2
 
-    def test_save_wav(self, tmp_path):
-        """Test saving audio as WAV file."""
+    @patch("mojiokoshi.recorder.sd.query_devices")
+    def test_list_devices_cached_until_refresh(self, mock_query):
+        """Test that PortAudio is queried once and again only on refresh."""
+        mock_query.side_effect = lambda kind=None: (
+            {"name": "Mic", "max_input_channels": 1} if kind == "input"
+            else [{"name": "Mic", "max_input_channels": 1}]
+        )
+
+        first = MicrophoneRecorder.list_devices()
+        first[0]["name"] = "changed"
+        second = MicrophoneRecorder.list_devices()
+        assert second[0]["name"] == "Mic"
+        assert mock_query.call_count == 2
+
+        MicrophoneRecorder.list_devices(refresh=True)
+        assert mock_query.call_count == 4
+
+    @patch("mojiokoshi.recorder.sd.InputStream")
+    def test_start_recording_passes_view_of_stored_frame(self, mock_stream_cls):
+        """Test that the chunk callback receives a flat view of the stored frame, not another copy."""
         recorder = MicrophoneRecorder()
+        chunks = []
+        recorder.start_recording(on_chunk=chunks.append)
+        callback = mock_stream_cls.call_args.kwargs["callback"]
 
-        # Create test audio data
-        audio = np.sin(2 * np.pi * 440 * np.linspace(0, 1, 16000)).astype(np.float32)
+        indata = np.arange(6, dtype=np.float32).reshape(6, 1)
+        callback(indata, 6, None, None)
+
+        assert chunks[0].shape == (6,)
+        assert np.shares_memory(chunks[0], recorder._frames[0])
+        assert not np.shares_memory(chunks[0], indata)
+
+    def test_save_wav(self, tmp_path, sine_1s_16k):
+        """Test saving audio as WAV file."""
+        recorder = MicrophoneRecorder()
 
         wav_path = tmp_path / "test.wav"
-        recorder.save_wav(audio, wav_path)
+        recorder.save_wav(sine_1s_16k, wav_path)
 
         assert wav_path.exists()
         assert wav_path.stat().st_size > 0
 
+    def test_save_wav_writes_16bit_pcm_header(self, tmp_path, sine_1s_16k):
+        """Test that the WAV header declares mono 16-bit PCM and the file holds 2 bytes per sample."""
+        recorder = MicrophoneRecorder()
+
+        wav_path = tmp_path / "test.wav"
+        recorder.save_wav(sine_1s_16k, wav_path)
+
+        data = wav_path.read_bytes()
+        assert len(data) == len(sine_1s_16k) * 2 + 44
+        riff, _, wave_id, fmt_id, _, audio_format, channels, sample_rate, byte_rate, block_align, bits = (
+            struct.unpack("<4sI4s4sIHHIIHH", data[:36])
+        )
+        assert (riff, wave_id, fmt_id) == (b"RIFF", b"WAVE", b"fmt ")
+        assert audio_format == 1  # PCM
+        assert (channels, sample_rate, bits) == (1, 16000, 16)
+        assert (byte_rate, block_align) == (32000, 2)
+
+    def test_save_wav_round_trip(self, tmp_path):
+        """Test that saved samples can be read back as mono 16-bit PCM."""
+        recorder = MicrophoneRecorder()
+        audio = np.array([0.0, 0.5, -0.5, 1.0], dtype=np.float32)
+
+        wav_path = tmp_path / "test.wav"
+        recorder.save_wav(audio, wav_path)
+
+        with wave.open(str(wav_path), "rb") as w:
+            assert w.getnchannels() == 1
+            assert w.getsampwidth() == 2
+            assert w.getframerate() == 16000
+            frames = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+        np.testing.assert_array_equal(frames, [0, 16384, -16384, 32767])
+
 
 class TestAudioConversion:
     """Tests for audio data conversion."""
 
     def test_float_to_int16_conversion(self):
         """Test that float32 audio is correctly converted to int16."""
-        recorder = MicrophoneRecorder()
-
         # Float32 audio in range [-1, 1]
         audio = np.array([0.0, 0.5, -0.5, 1.0, -1.0], dtype=np.float32)
 
-        # Expected int16 values
-        expected = np.array([0, 16383, -16383, 32767, -32767], dtype=np.int16)
+        # Expected int16 values (scale 2^15, +1.0 saturates to the int16 maximum)
+        expected = np.array([0, 16384, -16384, 32767, -32768], dtype=np.int16)
 
         # Convert
-        audio_int16 = (audio * 32767).astype(np.int16)
+        audio_int16 = float_to_int16(audio)
 
         np.testing.assert_array_equal(audio_int16, expected)
+
+    def test_float_to_int16_rounds_to_nearest(self):
+        """Test that samples are rounded instead of truncated toward zero."""
+        audio = np.array([0.9, -0.9, 0.4]) / 32768
+
+        np.testing.assert_array_equal(float_to_int16(audio), [1, -1, 0])
+
+    def test_int16_round_trip_is_identity(self):
+        """Test that int16 -> float32 (/32768, as ffmpeg decodes) -> int16 is lossless."""
+        samples = np.arange(-32768, 32768, dtype=np.int16)
+        audio = samples.astype(np.float32) / 32768.0
+
+        np.testing.assert_array_equal(float_to_int16(audio), samples)
+
+    def test_float_to_int16_clips_out_of_range(self):
+        """Test that out-of-range samples saturate instead of wrapping around."""
+        audio = np.array([1.5, -1.5, 0.5], dtype=np.float32)
+
+        audio_int16 = float_to_int16(audio)
+
+        assert audio_int16.dtype == np.int16
+        np.testing.assert_array_equal(audio_int16, [32767, -32768, 16384])
+
+    def test_float_to_int16_writes_into_out(self):
+        """Test that the conversion reuses preallocated buffers."""
+        audio = np.array([0.0, 0.5, -0.5], dtype=np.float32)
+        buf = np.empty(3, dtype=np.int16)
+        scratch = np.empty(3, dtype=np.float32)
+
+        result = float_to_int16(audio, out=buf, scratch=scratch)
+
+        assert result is buf
+        np.testing.assert_array_equal(buf, [0, 16384, -16384])
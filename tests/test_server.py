@@ -0,0 +1,123 @@
+"""Tests for warm transcription server module."""
+
+import json
+import threading
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from mojiokoshi.server import TranscriptionServer, request_transcription, transcribe_via_server
+from mojiokoshi.transcriber import TranscriptionResult
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return tmp_path / "mojiokoshi.sock"
+
+
+class TestTranscriptionServer:
+    """Tests for TranscriptionServer and its client helpers."""
+
+    def test_no_server_returns_none(self, socket_path):
+        """Test that clients fall back when nothing is listening."""
+        assert transcribe_via_server("base", "ja", path="a.wav", socket_path=socket_path) is None
+
+    @patch("mojiokoshi.server.WhisperTranscriber")
+    def test_transcribe_array_round_trip(self, mock_transcriber_cls, socket_path):
+        """Test that audio arrays are sent as raw float32 and results come back."""
+        mock_transcriber_cls.return_value.transcribe_array.return_value = TranscriptionResult(
+            text="こんにちは", segments=[], language="ja"
+        )
+        audio = np.linspace(-1, 1, 1600, dtype=np.float32)
+
+        with TranscriptionServer(model_name="base", socket_path=socket_path) as server:
+            thread = threading.Thread(target=server.handle_request)
+            thread.start()
+            result = transcribe_via_server("base", "ja", audio=audio, socket_path=socket_path)
+            thread.join(timeout=5)
+
+        assert result == TranscriptionResult(text="こんにちは", segments=[], language="ja")
+        mock_transcriber_cls.assert_called_once_with(model_name="base", language="ja", fast=False)
+        received = mock_transcriber_cls.return_value.transcribe_array.call_args[0][0]
+        np.testing.assert_array_equal(received, audio)
+        assert not socket_path.exists()
+
+    @patch("mojiokoshi.server.WhisperTranscriber")
+    def test_server_error_is_raised_on_client(self, mock_transcriber_cls, socket_path, tmp_path):
+        """Test that a failure inside the server is reported to the client."""
+        mock_transcriber_cls.return_value.transcribe.side_effect = FileNotFoundError("missing")
+
+        with TranscriptionServer(socket_path=socket_path) as server:
+            thread = threading.Thread(target=server.handle_request)
+            thread.start()
+            with pytest.raises(RuntimeError, match="missing"):
+                transcribe_via_server("large-v3", "ja", path=tmp_path / "a.wav", socket_path=socket_path)
+            thread.join(timeout=5)
+
+        requested_path = mock_transcriber_cls.return_value.transcribe.call_args[0][0]
+        assert requested_path == str((tmp_path / "a.wav").resolve())
+
+    def test_stale_socket_is_replaced(self, socket_path):
+        """Test that a leftover socket file from a crashed server is removed."""
+        socket_path.touch()
+
+        with TranscriptionServer(socket_path=socket_path) as server:
+            thread = threading.Thread(target=server.handle_request)
+            thread.start()
+            assert request_transcription({"ping": True}, socket_path) == {"ok": True}
+            thread.join(timeout=5)
+
+    @patch("mojiokoshi.server.WhisperTranscriber")
+    def test_client_disconnect_does_not_stop_server(self, mock_transcriber_cls, socket_path):
+        """Test that a client closing before the response leaves the server serving."""
+        transcribing = threading.Event()
+        release = threading.Event()
+
+        def slow_transcribe(path):
+            transcribing.set()
+            release.wait(timeout=5)
+            return TranscriptionResult(text="遅い", segments=[], language="ja")
+
+        mock_transcriber_cls.return_value.transcribe.side_effect = slow_transcribe
+        errors = []
+
+        def serve():
+            try:
+                server.handle_request()
+            except Exception as e:
+                errors.append(e)
+
+        with TranscriptionServer(socket_path=socket_path) as server:
+            thread = threading.Thread(target=serve)
+            thread.start()
+            client = Client(str(socket_path), family="AF_UNIX")
+            client.send_bytes(json.dumps({"path": "/tmp/a.wav"}).encode("utf-8"))
+            assert transcribing.wait(timeout=5)
+            client.close()
+            release.set()
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+            assert errors == []
+
+            thread = threading.Thread(target=server.handle_request)
+            thread.start()
+            assert request_transcription({"ping": True}, socket_path) == {"ok": True}
+            thread.join(timeout=5)
+
+    def test_server_closing_without_response_returns_none(self, socket_path):
+        """Test that a server dying mid-request makes the client fall back instead of crashing."""
+        listener = Listener(str(socket_path), family="AF_UNIX")
+
+        def accept_and_close():
+            with listener.accept() as conn:
+                conn.recv_bytes()
+
+        thread = threading.Thread(target=accept_and_close)
+        thread.start()
+        try:
+            assert transcribe_via_server("base", "ja", path="a.wav", socket_path=socket_path) is None
+        finally:
+            thread.join(timeout=5)
+            listener.close()
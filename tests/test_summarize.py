@@ -1,23 +1,58 @@
 """Tests for summarize module."""
 
+import http.client
 import json
-import urllib.error
 import pytest
 from unittest.mock import patch, MagicMock
 from mojiokoshi.summarize import (
     call_ollama,
     correct_chunk,
+    correct_full_transcript,
     summarize,
+    summarize_corrected_text,
     to_markdown,
     MeetingNotes,
-    CorrectedChunk,
+    _MEETING_NOTES_SCHEMA,
     CORRECTION_PROMPT,
     SUMMARY_PROMPT,
+    MERGE_PROMPT,
     OLLAMA_API,
+    _find_sentence_ends,
     split_into_chunks_with_context,
 )
 
 
+def _stream_lines(content: str) -> list[bytes]:
+    """Build NDJSON lines of a streaming Ollama chat response split in two parts."""
+    half = len(content) // 2
+    parts = [content[:half], content[half:]]
+    lines = [
+        json.dumps({"message": {"content": part}, "done": False}).encode("utf-8") + b"\n"
+        for part in parts
+    ]
+    lines.append(json.dumps({"message": {"content": ""}, "done": True}).encode("utf-8") + b"\n")
+    return lines
+
+
+class _FakeResponse:
+    """Minimal stand-in for http.client.HTTPResponse without MagicMock bookkeeping."""
+
+    def __init__(self, lines: list[bytes], status: int = 200):
+        self.status = status
+        self._lines = lines
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def read(self) -> bytes:
+        return b"".join(self._lines)
+
+
+def _payload(mock_post: MagicMock, index: int = 0) -> dict:
+    """Decode the JSON body of the index-th request sent through _post()."""
+    return json.loads(mock_post.call_args_list[index][0][0].decode("utf-8"))
+
+
 class TestMeetingNotes:
     """Tests for MeetingNotes Pydantic model."""
 
@@ -49,10 +84,15 @@ class TestMeetingNotes:
         assert "action_items" in schema["properties"]
         assert "notable_quotes" in schema["properties"]
 
-    def test_corrected_chunk_schema(self):
-        """Test CorrectedChunk schema structure."""
-        chunk = CorrectedChunk(corrected_text="修正済みテキスト")
-        assert chunk.corrected_text == "修正済みテキスト"
+    @patch("mojiokoshi.summarize.call_ollama")
+    def test_json_schema_is_module_constant(self, mock_call):
+        """Test that the schema sent to Ollama is the one generated at import time."""
+        mock_call.return_value = _notes_json("概要")
+
+        summarize_corrected_text("短いテキスト。", "test-model")
+
+        assert mock_call.call_args[1]["schema"] is _MEETING_NOTES_SCHEMA
+        assert _MEETING_NOTES_SCHEMA == MeetingNotes.model_json_schema()
 
 
 class TestToMarkdown:
@@ -111,6 +151,20 @@ class TestSummarize:
         assert "フィラー" in CORRECTION_PROMPT
         assert "修正対象" in CORRECTION_PROMPT
 
+    @patch("mojiokoshi.summarize._chat")
+    def test_correction_prompt_is_static_system_prefix(self, mock_call):
+        """Test that every chunk shares an identical system prompt and only the user message varies."""
+        mock_call.return_value = ("修正済み", "stop")
+        correct_chunk("", "一つ目のチャンク", "test-model")
+        correct_chunk("一つ目の末尾", "二つ目のチャンク", "test-model")
+
+        first, second = (c[0][0] for c in mock_call.call_args_list)
+        assert first[0] == second[0] == {"role": "system", "content": CORRECTION_PROMPT}
+        assert [m["role"] for m in second] == ["system", "user"]
+        # チャンク固有のテキストは末尾のユーザーメッセージにだけ入る
+        assert second[1]["content"].startswith("===前の文脈===\n一つ目の末尾")
+        assert second[1]["content"].endswith("二つ目のチャンク")
+
     def test_summary_prompt_contains_key_instructions(self):
         """Test summary prompt contains important instructions."""
         assert "議事録" in SUMMARY_PROMPT
@@ -118,11 +172,10 @@ class TestSummarize:
         assert "summary" in SUMMARY_PROMPT
         assert "key_points" in SUMMARY_PROMPT
 
-    @patch("mojiokoshi.summarize.urllib.request.urlopen")
-    def test_summarize_success(self, mock_urlopen):
+    @patch("mojiokoshi.summarize._post")
+    def test_summarize_success(self, mock_post):
         """Test successful summarization with 2-stage processing."""
         # Mock responses for correction (stage 1) and summary (stage 2)
-        correction_response = {"corrected_text": "修正テキスト"}
         summary_response = {
             "summary": "テスト概要",
             "key_points": ["ポイント1"],
@@ -132,27 +185,29 @@ class TestSummarize:
             "notable_quotes": ["「引用1」"],
         }
 
-        mock_response = MagicMock()
         # First call returns correction, second returns summary
-        mock_response.read.side_effect = [
-            json.dumps({"message": {"content": json.dumps(correction_response)}}).encode("utf-8"),
-            json.dumps({"message": {"content": json.dumps(summary_response)}}).encode("utf-8"),
+        mock_post.side_effect = [
+            _FakeResponse(_stream_lines("修正テキスト")),
+            _FakeResponse(_stream_lines(json.dumps(summary_response))),
         ]
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
 
         result = summarize("テストテキスト", model="qwen3:14b")
 
         assert "# 議事録" in result
         assert "テスト概要" in result
+        assert "修正テキスト" in result
         # 2 calls: 1 for correction (short text = 1 chunk), 1 for summary
-        assert mock_urlopen.call_count == 2
-
-    @patch("mojiokoshi.summarize.urllib.request.urlopen")
-    def test_summarize_uses_different_models(self, mock_urlopen):
+        assert mock_post.call_count == 2
+        # Correction is plain text, only the summary uses structured output
+        assert "format" not in _payload(mock_post, 0)
+        assert _payload(mock_post, 1)["format"] == _MEETING_NOTES_SCHEMA
+        # Only the correction disables thinking
+        assert _payload(mock_post, 0)["think"] is False
+        assert "think" not in _payload(mock_post, 1)
+
+    @patch("mojiokoshi.summarize._post")
+    def test_summarize_uses_different_models(self, mock_post):
         """Test that correction and summary use different models."""
-        correction_response = {"corrected_text": "修正テキスト"}
         summary_response = {
             "summary": "概要",
             "key_points": ["ポイント"],
@@ -162,137 +217,424 @@ class TestSummarize:
             "notable_quotes": [],
         }
 
-        mock_response = MagicMock()
-        mock_response.read.side_effect = [
-            json.dumps({"message": {"content": json.dumps(correction_response)}}).encode("utf-8"),
-            json.dumps({"message": {"content": json.dumps(summary_response)}}).encode("utf-8"),
+        mock_post.side_effect = [
+            _FakeResponse(_stream_lines("修正テキスト")),
+            _FakeResponse(_stream_lines(json.dumps(summary_response))),
         ]
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
 
         summarize("test", model="qwen3:14b", correction_model="qwen3:8b")
 
         # Check first call uses correction model
-        first_call = mock_urlopen.call_args_list[0]
-        first_payload = json.loads(first_call[0][0].data.decode("utf-8"))
-        assert first_payload["model"] == "qwen3:8b"
+        assert _payload(mock_post, 0)["model"] == "qwen3:8b"
 
         # Check second call uses summary model
-        second_call = mock_urlopen.call_args_list[1]
-        second_payload = json.loads(second_call[0][0].data.decode("utf-8"))
-        assert second_payload["model"] == "qwen3:14b"
+        assert _payload(mock_post, 1)["model"] == "qwen3:14b"
 
 
 class TestCallOllama:
     """Tests for call_ollama function."""
 
-    @patch("mojiokoshi.summarize.urllib.request.urlopen")
-    def test_call_ollama_success(self, mock_urlopen):
+    @patch("mojiokoshi.summarize.KEEP_ALIVE", None)
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_success(self, mock_post):
         """Test successful API call."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {"message": {"content": "response text"}}
-        ).encode("utf-8")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_post.return_value = _FakeResponse(_stream_lines("response text"))
 
         result = call_ollama([{"role": "user", "content": "test"}], "test-model")
         assert result == "response text"
+        assert _payload(mock_post)["stream"] is True
+        # OLLAMA_KEEP_ALIVEが未設定ならOllamaの既定の保持時間に任せる
+        assert "keep_alive" not in _payload(mock_post)
+
+    @patch("mojiokoshi.summarize.KEEP_ALIVE", "30m")
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_sends_exported_keep_alive(self, mock_post):
+        """Test that an exported OLLAMA_KEEP_ALIVE is forwarded with the request."""
+        mock_post.return_value = _FakeResponse(_stream_lines("response text"))
+
+        call_ollama([{"role": "user", "content": "test"}], "test-model")
+
+        assert _payload(mock_post)["keep_alive"] == "30m"
 
-    @patch("mojiokoshi.summarize.urllib.request.urlopen")
-    def test_call_ollama_empty_response_raises(self, mock_urlopen):
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_empty_response_raises(self, mock_post):
         """Test that empty response content raises ValueError."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {"message": {"content": ""}}
-        ).encode("utf-8")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_post.return_value = _FakeResponse(_stream_lines(""))
 
         with pytest.raises(ValueError, match="empty response"):
             call_ollama([{"role": "user", "content": "test"}], "test-model")
 
-    @patch("mojiokoshi.summarize.urllib.request.urlopen")
-    def test_call_ollama_retry_on_url_error(self, mock_urlopen):
-        """Test retry on URLError then success."""
-        success_response = MagicMock()
-        success_response.read.return_value = json.dumps(
-            {"message": {"content": "ok"}}
-        ).encode("utf-8")
-        success_response.__enter__ = MagicMock(return_value=success_response)
-        success_response.__exit__ = MagicMock(return_value=False)
-
-        mock_urlopen.side_effect = [
-            urllib.error.URLError("connection refused"),
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_retry_on_connection_error(self, mock_post):
+        """Test retry on connection error then success."""
+        success_response = _FakeResponse(_stream_lines("ok"))
+
+        mock_post.side_effect = [
+            ConnectionRefusedError("connection refused"),
             success_response,
         ]
 
         result = call_ollama([{"role": "user", "content": "test"}], "test-model")
         assert result == "ok"
-        assert mock_urlopen.call_count == 2
+        assert mock_post.call_count == 2
 
-    @patch("mojiokoshi.summarize.urllib.request.urlopen")
-    def test_call_ollama_raises_after_max_retries(self, mock_urlopen):
-        """Test that URLError is raised after all retries exhausted."""
-        mock_urlopen.side_effect = urllib.error.URLError("connection refused")
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_raises_after_max_retries(self, mock_post):
+        """Test that the connection error is raised after all retries exhausted."""
+        mock_post.side_effect = ConnectionRefusedError("connection refused")
 
-        with pytest.raises(urllib.error.URLError):
+        with pytest.raises(ConnectionRefusedError):
             call_ollama([{"role": "user", "content": "test"}], "test-model")
-        assert mock_urlopen.call_count == 2  # MAX_RETRIES = 2
+        assert mock_post.call_count == 2  # MAX_RETRIES = 2
 
-    @patch("mojiokoshi.summarize.urllib.request.urlopen")
-    def test_call_ollama_retry_on_json_decode_error(self, mock_urlopen):
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_retry_on_json_decode_error(self, mock_post):
         """Test retry on JSONDecodeError then success."""
-        success_response = MagicMock()
-        success_response.read.return_value = json.dumps(
-            {"message": {"content": "ok"}}
-        ).encode("utf-8")
-        success_response.__enter__ = MagicMock(return_value=success_response)
-        success_response.__exit__ = MagicMock(return_value=False)
-
-        bad_response = MagicMock()
-        bad_response.read.return_value = b"not valid json"
-        bad_response.__enter__ = MagicMock(return_value=bad_response)
-        bad_response.__exit__ = MagicMock(return_value=False)
+        success_response = _FakeResponse(_stream_lines("ok"))
+        bad_response = _FakeResponse([b"not valid json\n"])
 
-        mock_urlopen.side_effect = [bad_response, success_response]
+        mock_post.side_effect = [bad_response, success_response]
 
         result = call_ollama([{"role": "user", "content": "test"}], "test-model")
         assert result == "ok"
-        assert mock_urlopen.call_count == 2
+        assert mock_post.call_count == 2
+
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_stream_error_raises(self, mock_post):
+        """Test that an error object in the stream raises ValueError."""
+        mock_post.return_value = _FakeResponse([b'{"error": "model not found"}\n'])
+
+        with pytest.raises(ValueError, match="model not found"):
+            call_ollama([{"role": "user", "content": "test"}], "test-model")
+
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_assembles_stream_incrementally(self, mock_post, caplog):
+        """Test that content is joined across NDJSON lines, skipping blank keep-alive lines."""
+        lines = [
+            json.dumps({"message": {"content": "校正"}, "done": False}).encode("utf-8") + b"\n",
+            b"\n",
+            json.dumps({"message": {"content": "済み"}, "done": False}).encode("utf-8") + b"\n",
+            json.dumps({
+                "message": {"content": ""}, "done": True, "done_reason": "length",
+                "prompt_eval_count": 12, "eval_count": 34,
+            }).encode("utf-8") + b"\n",
+        ]
+        mock_post.return_value = _FakeResponse(lines)
+
+        with caplog.at_level("DEBUG", logger="mojiokoshi.summarize"):
+            result = call_ollama([{"role": "user", "content": "test"}], "test-model")
+
+        assert result == "校正済み"
+        assert "12 prompt tokens evaluated, 34 tokens generated" in caplog.text
+        assert "truncated at num_predict limit" in caplog.text
+
+    @patch("mojiokoshi.summarize._post")
+    def test_call_ollama_http_error_raises(self, mock_post):
+        """Test that a non-200 status is retried and then raised."""
+        mock_post.return_value = _FakeResponse([b'{"error": "model not found"}'], status=404)
+
+        with pytest.raises(http.client.HTTPException, match="404"):
+            call_ollama([{"role": "user", "content": "test"}], "test-model")
+        assert mock_post.call_count == 2
+
+
+class TestOllamaConnection:
+    """Tests for the keep-alive connection to Ollama."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_connection(self):
+        from mojiokoshi.summarize import close_connections
+        close_connections()
+        yield
+        close_connections()
+
+    @patch("mojiokoshi.summarize.http.client.HTTPConnection")
+    def test_connection_reused_across_calls(self, mock_conn_cls):
+        """Test that consecutive calls share one HTTP connection."""
+        conn = mock_conn_cls.return_value
+        conn.sock = None
+        conn.getresponse.side_effect = [
+            _FakeResponse(_stream_lines("one")),
+            _FakeResponse(_stream_lines("two")),
+        ]
+
+        assert call_ollama([{"role": "user", "content": "a"}], "test-model") == "one"
+        assert call_ollama([{"role": "user", "content": "b"}], "test-model") == "two"
+
+        mock_conn_cls.assert_called_once_with("localhost", 11434)
+        assert conn.request.call_count == 2
+        assert conn.request.call_args[0][:2] == ("POST", "/api/chat")
+
+    @patch("mojiokoshi.summarize.http.client.HTTPConnection")
+    def test_connection_shared_across_threads(self, mock_conn_cls):
+        """Test that a connection released by one thread is reused by another."""
+        import threading
+
+        conn = mock_conn_cls.return_value
+        conn.sock = None
+        conn.getresponse.side_effect = [
+            _FakeResponse(_stream_lines("one")),
+            _FakeResponse(_stream_lines("two")),
+        ]
+
+        assert call_ollama([{"role": "user", "content": "a"}], "test-model") == "one"
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(call_ollama([{"role": "user", "content": "b"}], "test-model"))
+        )
+        thread.start()
+        thread.join()
+
+        assert results == ["two"]
+        mock_conn_cls.assert_called_once()
+
+    @patch("mojiokoshi.summarize.http.client.HTTPConnection")
+    def test_close_connections_closes_idle_pool(self, mock_conn_cls):
+        """Test that pooled keep-alive connections are closed and not reused."""
+        from mojiokoshi.summarize import _idle_connections, close_connections
+
+        first, second = MagicMock(sock=None), MagicMock(sock=None)
+        mock_conn_cls.side_effect = [first, second]
+        first.getresponse.return_value = _FakeResponse(_stream_lines("one"))
+        second.getresponse.return_value = _FakeResponse(_stream_lines("two"))
+
+        assert call_ollama([{"role": "user", "content": "a"}], "test-model") == "one"
+        assert _idle_connections == [first]
+
+        close_connections()
+
+        first.close.assert_called_once()
+        assert _idle_connections == []
+        assert call_ollama([{"role": "user", "content": "b"}], "test-model") == "two"
+        assert mock_conn_cls.call_count == 2
+
+    @patch("mojiokoshi.summarize.http.client.HTTPConnection")
+    def test_stale_connection_is_reopened(self, mock_conn_cls):
+        """Test that a keep-alive socket closed by the server is retried once."""
+        conn = mock_conn_cls.return_value
+        conn.sock = MagicMock()  # reused connection
+        conn.getresponse.side_effect = [
+            http.client.RemoteDisconnected("closed"),
+            _FakeResponse(_stream_lines("ok")),
+        ]
+
+        assert call_ollama([{"role": "user", "content": "a"}], "test-model") == "ok"
+        assert conn.request.call_count == 2
+        conn.close.assert_called()
 
 
 class TestCorrectChunk:
     """Tests for correct_chunk function."""
 
-    @patch("mojiokoshi.summarize.call_ollama")
+    @patch("mojiokoshi.summarize._chat")
     def test_correct_chunk_with_context(self, mock_call):
         """Test correction with context."""
-        mock_call.return_value = json.dumps({"corrected_text": "修正済み"})
+        mock_call.return_value = ("修正済み", "stop")
         result = correct_chunk("前の文脈", "メインテキスト", "test-model")
-        assert result == "修正済み"
+        assert result == ("修正済み", True)
         # Verify context is included in the prompt
         call_args = mock_call.call_args[0][0]  # messages
         assert "前の文脈" in call_args[1]["content"]
 
-    @patch("mojiokoshi.summarize.call_ollama")
+    @patch("mojiokoshi.summarize._chat")
     def test_correct_chunk_without_context(self, mock_call):
         """Test correction without context."""
-        mock_call.return_value = json.dumps({"corrected_text": "修正済み"})
+        mock_call.return_value = ("修正済み", "stop")
         result = correct_chunk("", "メインテキスト", "test-model")
-        assert result == "修正済み"
+        assert result == ("修正済み", True)
         call_args = mock_call.call_args[0][0]
         assert "前の文脈" not in call_args[1]["content"]
 
-    @patch("mojiokoshi.summarize.call_ollama")
-    def test_correct_chunk_missing_key_fallback(self, mock_call):
-        """Test fallback when corrected_text key is missing."""
-        mock_call.return_value = json.dumps({"wrong_key": "value"})
+    @patch("mojiokoshi.summarize._chat")
+    def test_correct_chunk_num_predict_scales_with_input(self, mock_call):
+        """Test that the output token limit follows the chunk length within bounds."""
+        mock_call.return_value = ("修正済み", "stop")
+
+        correct_chunk("", "短い", "test-model")
+        assert mock_call.call_args[1]["num_predict"] == 512
+
+        correct_chunk("", "あ" * 1000, "test-model")
+        assert mock_call.call_args[1]["num_predict"] == 2000
+
+        correct_chunk("", "あ" * 4000, "test-model")
+        assert mock_call.call_args[1]["num_predict"] == 6000
+
+    @patch("mojiokoshi.summarize._chat")
+    def test_correct_chunk_strips_whitespace_and_thinking(self, mock_call):
+        """Test that surrounding whitespace and <think> blocks are removed."""
+        mock_call.return_value = ("<think>\n考え中\n</think>\n\n修正済み\n", "stop")
+        result = correct_chunk("", "メインテキスト", "test-model")
+        assert result == ("修正済み", True)
+        assert mock_call.call_args[1].get("schema") is None
+        assert mock_call.call_args[1]["think"] is False
+
+    @patch("mojiokoshi.summarize._chat")
+    def test_correct_chunk_empty_output_fallback(self, mock_call):
+        """Test fallback to the original text when nothing but thinking is returned."""
+        mock_call.return_value = ("<think>考え中</think>", "stop")
         result = correct_chunk("", "元のテキスト", "test-model")
-        assert result == "元のテキスト"
+        assert result == ("元のテキスト", False)
+
+    @patch("mojiokoshi.summarize._chat")
+    def test_correct_chunk_truncated_output_is_incomplete(self, mock_call):
+        """Test that output cut off at num_predict is marked as incomplete."""
+        mock_call.return_value = ("途中まで", "length")
+        result = correct_chunk("", "メインテキスト", "test-model")
+        assert result == ("途中まで", False)
+
+
+class TestCorrectFullTranscript:
+    """Tests for correct_full_transcript function."""
+
+    @patch("mojiokoshi.summarize.split_into_chunks_with_context")
+    @patch("mojiokoshi.summarize.correct_chunk")
+    def test_parallel_correction_preserves_order(self, mock_correct, mock_split):
+        """Test that chunks corrected concurrently are joined in original order."""
+        import threading
+        import time
+
+        mock_split.return_value = [("", "A"), ("A", "B"), ("B", "C"), ("C", "D")]
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        def slow_correct(context, main_text, model):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            # Later chunks finish first to prove ordering does not depend on timing
+            time.sleep(0.05 * (ord("E") - ord(main_text)))
+            with lock:
+                active -= 1
+            return main_text.lower(), True
+
+        mock_correct.side_effect = slow_correct
+
+        result = correct_full_transcript("ABCD", "test-model", parallel=4)
+
+        assert result == "a\n\nb\n\nc\n\nd"
+        assert max_active > 1
+
+    @patch("mojiokoshi.summarize.correct_chunk")
+    def test_sequential_when_parallel_is_one(self, mock_correct):
+        """Test that parallel=1 still corrects every chunk."""
+        mock_correct.side_effect = lambda context, main_text, model: (main_text, True)
+        result = correct_full_transcript("テキスト", "test-model", parallel=1)
+        assert result == "テキスト"
+        mock_correct.assert_called_once_with("", "テキスト", "test-model")
+
+    @patch("mojiokoshi.summarize._post")
+    def test_correction_cache_hit(self, mock_post, tmp_path):
+        """Test that a second run with the same input is served from the cache."""
+        mock_post.side_effect = lambda body, timeout: _FakeResponse(_stream_lines("修正済み"))
+
+        first = correct_full_transcript("テキスト", "test-model", cache_dir=tmp_path)
+        second = correct_full_transcript("テキスト", "test-model", cache_dir=tmp_path)
+
+        assert first == second == "修正済み"
+        assert mock_post.call_count == 1
+
+        # モデルが変われば別のキャッシュになる
+        correct_full_transcript("テキスト", "other-model", cache_dir=tmp_path)
+        assert mock_post.call_count == 2
+
+    @patch("mojiokoshi.summarize.correct_chunk")
+    def test_incomplete_correction_not_cached(self, mock_correct, tmp_path):
+        """Test that truncated or fallback results are corrected again on the next run."""
+        mock_correct.return_value = ("途中まで", False)
+
+        correct_full_transcript("テキスト", "test-model", cache_dir=tmp_path)
+        correct_full_transcript("テキスト", "test-model", cache_dir=tmp_path)
+
+        assert mock_correct.call_count == 2
+        assert list(tmp_path.iterdir()) == []
+
+    @patch("mojiokoshi.summarize.correct_chunk")
+    def test_unusable_cache_dir_is_not_fatal(self, mock_correct, tmp_path, caplog):
+        """Test that cache read and write failures only log a warning."""
+        mock_correct.return_value = ("修正済み", True)
+        not_a_dir = tmp_path / "file"
+        not_a_dir.write_text("")
+
+        with caplog.at_level("WARNING"):
+            result = correct_full_transcript("テキスト", "test-model", cache_dir=not_a_dir / "cache")
+
+        assert result == "修正済み"
+        assert "Failed to write correction cache" in caplog.text
+
+    @patch("mojiokoshi.summarize.correct_chunk")
+    def test_undecodable_cache_entry_is_ignored(self, mock_correct, tmp_path, caplog):
+        """Test that a corrupt cache file is reported and the chunk corrected again."""
+        from mojiokoshi.summarize import _correction_cache_path
+
+        mock_correct.return_value = ("修正済み", True)
+        _correction_cache_path(tmp_path, "", "テキスト", "test-model").write_bytes(b"\xff\xfe\xfd")
+
+        with caplog.at_level("WARNING"):
+            result = correct_full_transcript("テキスト", "test-model", cache_dir=tmp_path)
+
+        assert result == "修正済み"
+        mock_correct.assert_called_once()
+        assert "Failed to read correction cache" in caplog.text
+
+
+def _notes_json(summary: str) -> str:
+    """Build a MeetingNotes JSON string with the given summary."""
+    return json.dumps({
+        "summary": summary,
+        "key_points": [],
+        "discussion_topics": [],
+        "decisions": [],
+        "action_items": [],
+        "notable_quotes": [],
+    }, ensure_ascii=False)
+
+
+class TestSummarizeCorrectedText:
+    """Tests for map-reduce summary generation."""
+
+    @patch("mojiokoshi.summarize.call_ollama")
+    def test_short_text_summarized_in_one_call(self, mock_call):
+        """Test that text within one section is summarized with a single request."""
+        mock_call.return_value = _notes_json("概要")
+
+        notes = summarize_corrected_text("短いテキスト。", "test-model")
+
+        assert notes.summary == "概要"
+        mock_call.assert_called_once()
+        assert mock_call.call_args[0][0][0]["content"] == SUMMARY_PROMPT
+
+    @patch("mojiokoshi.summarize.call_ollama")
+    def test_response_missing_fields_raises_validation_error(self, mock_call):
+        """Test that a response not matching the MeetingNotes schema is rejected."""
+        from pydantic import ValidationError
+
+        mock_call.return_value = '{"summary": "概要"}'
+
+        with pytest.raises(ValidationError):
+            summarize_corrected_text("短いテキスト。", "test-model")
+
+    @patch("mojiokoshi.summarize.SUMMARY_SECTION_SIZE", 11)
+    @patch("mojiokoshi.summarize.call_ollama")
+    def test_long_text_summarized_per_section_then_merged(self, mock_call):
+        """Test that long text is summarized per section and the partial notes are merged in order."""
+        def side_effect(messages, model, **kwargs):
+            if messages[0]["content"] == MERGE_PROMPT:
+                return _notes_json("統合")
+            return _notes_json("部分")
+        mock_call.side_effect = side_effect
+
+        notes = summarize_corrected_text("あいうえおかきくけこ。さしすせそたちつてと。", "test-model", parallel=2)
+
+        assert notes.summary == "統合"
+        # 2区間の要約 + 統合1回
+        assert mock_call.call_count == 3
+        merge_messages = mock_call.call_args_list[-1][0][0]
+        assert merge_messages[0]["content"] == MERGE_PROMPT
+        merge_input = merge_messages[1]["content"]
+        assert "区間1/2" in merge_input
+        assert merge_input.index("区間1/2") < merge_input.index("区間2/2")
 
 
 class TestChunking:
@@ -301,20 +643,20 @@ class TestChunking:
     def test_split_short_text(self):
         """Test splitting text shorter than chunk size."""
         text = "短いテキスト"
-        chunks = split_into_chunks_with_context(text, chunk_size=100, context_size=20)
+        chunks = list(split_into_chunks_with_context(text, chunk_size=100, context_size=20))
         assert len(chunks) == 1
         assert chunks[0] == ("", "短いテキスト")
 
     def test_split_long_text(self):
         """Test splitting text into multiple chunks."""
         text = "A" * 100
-        chunks = split_into_chunks_with_context(text, chunk_size=30, context_size=10)
+        chunks = list(split_into_chunks_with_context(text, chunk_size=30, context_size=10))
         assert len(chunks) == 4  # 100 / 30 = 3.33 -> 4 chunks
 
     def test_context_from_previous_chunk(self):
         """Test that context is taken from previous chunk."""
         text = "前の文脈" + "メイン部分"  # 4 + 5 = 9 chars
-        chunks = split_into_chunks_with_context(text, chunk_size=5, context_size=4)
+        chunks = list(split_into_chunks_with_context(text, chunk_size=5, context_size=4))
         assert len(chunks) == 2
         # First chunk has no context
         assert chunks[0] == ("", "前の文脈メ")
@@ -322,6 +664,40 @@ class TestChunking:
         assert chunks[1][0] == "の文脈メ"  # context
         assert chunks[1][1] == "イン部分"  # main text
 
+    def test_split_on_sentence_boundaries(self):
+        """Test that chunks end on sentence terminators when one is in range."""
+        text = "一二三四五六七。八九十。一二三四五六七八九十。"
+        chunks = list(split_into_chunks_with_context(text, chunk_size=15, context_size=3))
+        assert [main for _, main in chunks] == ["一二三四五六七。八九十。", "一二三四五六七八九十。"]
+        assert chunks[1][0] == "九十。"
+        assert "".join(main for _, main in chunks) == text
+
+    def test_long_text_chunks_end_on_terminators(self):
+        """Test that every chunk but the last ends on a sentence terminator."""
+        text = "".join(f"{'あ' * n}。" for n in (6, 9, 4, 11, 7, 5, 8)) + "終わり"
+        chunks = list(split_into_chunks_with_context(text, chunk_size=20, context_size=5))
+        assert len(chunks) > 2
+        for _, main in chunks[:-1]:
+            assert main.endswith("。")
+        assert "".join(main for _, main in chunks) == text
+
+    def test_find_sentence_ends(self):
+        """Test that sentence ends are the positions just after each terminator."""
+        assert _find_sentence_ends("あ。い！う？\nえ") == [2, 4, 6, 7]
+        assert _find_sentence_ends("区切りなし") == []
+
+    def test_split_is_lazy(self):
+        """Test that chunks are produced on demand rather than all at once."""
+        chunks = split_into_chunks_with_context("A" * 100, chunk_size=30, context_size=10)
+        assert next(chunks) == ("", "A" * 30)
+        assert next(chunks) == ("A" * 10, "A" * 30)
+
+    def test_split_ignores_early_boundary(self):
+        """Test that a terminator in the first half of a chunk does not shrink it."""
+        text = "あ。" + "い" * 20
+        chunks = list(split_into_chunks_with_context(text, chunk_size=10, context_size=0))
+        assert chunks[0][1] == "あ。" + "い" * 8
+
 
 class TestSummarizeMain:
     """Tests for summarize CLI main function."""
@@ -347,6 +723,60 @@ class TestSummarizeMain:
                 summarize_main()
             assert exc_info.value.code == 1
 
+    @patch("mojiokoshi.summarize._post")
+    def test_main_reports_invalid_summary_json(self, mock_post, tmp_path, capsys):
+        """Test that an unparsable structured summary is reported as a JSON error."""
+        from mojiokoshi.summarize import main as summarize_main
+
+        input_file = tmp_path / "transcript.txt"
+        input_file.write_text("テキスト", encoding="utf-8")
+        mock_post.side_effect = [
+            _FakeResponse(_stream_lines("修正済み")),
+            _FakeResponse(_stream_lines('{"summary": ')),
+        ]
+
+        with patch("sys.argv", ["summarize", str(input_file), "--no-cache"]):
+            with pytest.raises(SystemExit) as exc_info:
+                summarize_main()
+        assert exc_info.value.code == 1
+        assert "Failed to parse JSON response" in capsys.readouterr().err
+
+    @patch("mojiokoshi.summarize.summarize")
+    def test_main_no_cache_flag(self, mock_summarize, tmp_path):
+        """Test that --no-cache disables the correction cache."""
+        from mojiokoshi.summarize import main as summarize_main, CORRECTION_CACHE_DIR
+
+        input_file = tmp_path / "transcript.txt"
+        input_file.write_text("テキスト", encoding="utf-8")
+        mock_summarize.return_value = "# 議事録"
+
+        with patch("sys.argv", ["summarize", str(input_file)]):
+            summarize_main()
+        assert mock_summarize.call_args[0][4] == CORRECTION_CACHE_DIR
+
+        with patch("sys.argv", ["summarize", str(input_file), "--no-cache"]):
+            summarize_main()
+        assert mock_summarize.call_args[0][4] is None
+
+
+class TestParallelRequestsFromEnv:
+    """Tests for reading the default concurrency from OLLAMA_NUM_PARALLEL."""
+
+    def test_parallel_requests_from_env(self, monkeypatch):
+        """Test that only a positive integer overrides the default."""
+        from mojiokoshi.summarize import _parallel_requests_from_env
+
+        monkeypatch.delenv("OLLAMA_NUM_PARALLEL", raising=False)
+        assert _parallel_requests_from_env() == 4
+
+        monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "2")
+        assert _parallel_requests_from_env() == 2
+
+        # 0はOllamaの自動設定、それ以外は不正な値
+        for value in ["0", "-1", "auto", ""]:
+            monkeypatch.setenv("OLLAMA_NUM_PARALLEL", value)
+            assert _parallel_requests_from_env() == 4
+
 
 class TestPrompts:
     """Tests for prompt content."""
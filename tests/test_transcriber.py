@@ -1,7 +1,15 @@
 """Tests for transcriber module."""
 
+import io
+import subprocess
+import sys
+
+import mlx.core as mx
+import numpy as np
 import pytest
-from mojiokoshi.transcriber import WhisperTranscriber, TranscriptionResult
+from unittest.mock import patch, MagicMock
+from mlx_whisper.audio import N_FRAMES, N_SAMPLES
+from mojiokoshi.transcriber import WhisperTranscriber, TranscriptionResult, iter_audio_windows
 
 
 class TestWhisperTranscriber:
@@ -13,6 +21,17 @@ class TestWhisperTranscriber:
         assert transcriber.model_name == "large-v3"
         assert transcriber.language == "ja"
         assert transcriber.model_path == "mlx-community/whisper-large-v3-mlx"
+        assert transcriber.fast is False
+
+    @patch("mojiokoshi.transcriber.ModelHolder.get_model")
+    def test_model_loaded_lazily_once(self, mock_get_model):
+        """Test that the model is not loaded on construction and is loaded only once on use."""
+        transcriber = WhisperTranscriber(model_name="tiny")
+        mock_get_model.assert_not_called()
+
+        assert transcriber.model is transcriber.model
+        mock_get_model.assert_called_once()
+        assert mock_get_model.call_args[0][0] == "mlx-community/whisper-tiny-mlx"
 
     def test_init_custom_model(self):
         """Test custom model initialization."""
@@ -43,6 +62,224 @@ class TestWhisperTranscriber:
         with pytest.raises(FileNotFoundError, match="Audio file not found"):
             transcriber.transcribe("/nonexistent/audio.wav")
 
+    @patch("mojiokoshi.transcriber.mlx_whisper.transcribe")
+    def test_transcribe_array_passes_float32_array(self, mock_transcribe):
+        """Test that transcribe_array hands the array to mlx-whisper without a temp file."""
+        mock_transcribe.return_value = {"text": " こんにちは ", "segments": [], "language": "ja"}
+        transcriber = WhisperTranscriber()
+        audio = np.zeros(16000, dtype=np.float64)
+
+        result = transcriber.transcribe_array(audio)
+
+        passed_audio = mock_transcribe.call_args[0][0]
+        assert isinstance(passed_audio, np.ndarray)
+        assert passed_audio.dtype == np.float32
+        assert mock_transcribe.call_args[1]["path_or_hf_repo"] == "mlx-community/whisper-large-v3-mlx"
+        assert result.text == "こんにちは"
+
+    @patch("mojiokoshi.transcriber.mlx_whisper.transcribe")
+    def test_fast_mode_disables_fallback_and_conditioning(self, mock_transcribe):
+        """Test that fast mode decodes once at temperature 0 without previous-text conditioning."""
+        mock_transcribe.return_value = {"text": "", "segments": [], "language": "ja"}
+
+        WhisperTranscriber().transcribe_array(np.zeros(16000, dtype=np.float32))
+        assert "temperature" not in mock_transcribe.call_args[1]
+
+        WhisperTranscriber(fast=True).transcribe_array(np.zeros(16000, dtype=np.float32))
+        assert mock_transcribe.call_args[1]["temperature"] == 0.0
+        assert mock_transcribe.call_args[1]["condition_on_previous_text"] is False
+
+    @patch("mojiokoshi.transcriber.iter_audio_windows")
+    def test_transcribe_short_file_in_single_pass(self, mock_windows, tmp_path):
+        """Test that in fast mode a file shorter than LONG_AUDIO_SEC is transcribed as one array."""
+        audio_path = tmp_path / "short.wav"
+        audio_path.touch()
+        mock_windows.return_value = iter([np.zeros(10, dtype=np.float32), np.ones(5, dtype=np.float32)])
+        transcriber = WhisperTranscriber(fast=True)
+
+        with patch.object(transcriber, "transcribe_array") as mock_array, \
+                patch.object(transcriber, "transcribe_batch") as mock_batch:
+            transcriber.transcribe(audio_path)
+
+        assert len(mock_array.call_args[0][0]) == 15
+        mock_batch.assert_not_called()
+
+    @patch("mojiokoshi.transcriber.LONG_AUDIO_SEC", 1)
+    @patch("mojiokoshi.transcriber.iter_audio_windows")
+    def test_transcribe_long_file_in_batches(self, mock_windows, tmp_path):
+        """Test that in fast mode a long file is decoded window by window in batches with time offsets."""
+        audio_path = tmp_path / "long.wav"
+        audio_path.touch()
+        mock_windows.return_value = iter([np.zeros(16000, dtype=np.float32)] * 10)
+        transcriber = WhisperTranscriber(fast=True)
+
+        def fake_batch(batch):
+            return [TranscriptionResult(text="" if i == 1 else "テキスト", segments=[], language="ja")
+                    for i in range(len(batch))]
+
+        with patch.object(transcriber, "transcribe_batch", side_effect=fake_batch) as mock_batch, \
+                patch.object(transcriber, "transcribe_array") as mock_array:
+            result = transcriber.transcribe(audio_path)
+
+        assert [len(c[0][0]) for c in mock_batch.call_args_list] == [8, 2]
+        mock_array.assert_not_called()
+        # 無音の窓（各バッチの2番目）はセグメントに含めないが時刻は進める
+        assert [s["start"] for s in result.segments] == [0.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+        assert result.text == "\n".join(["テキスト"] * 8)
+
+    @patch("mojiokoshi.transcriber.mlx_whisper.transcribe")
+    @patch("mojiokoshi.transcriber.iter_audio_windows")
+    def test_transcribe_file_passed_to_mlx_whisper_by_default(self, mock_windows, mock_transcribe, tmp_path):
+        """Test that without fast mode the file path goes straight to mlx_whisper.transcribe."""
+        audio_path = tmp_path / "long.wav"
+        audio_path.touch()
+        mock_transcribe.return_value = {"text": " 結果 ", "segments": [], "language": "ja"}
+
+        result = WhisperTranscriber().transcribe(audio_path)
+
+        assert mock_transcribe.call_args[0][0] == str(audio_path)
+        assert "temperature" not in mock_transcribe.call_args[1]
+        mock_windows.assert_not_called()
+        assert result.text == "結果"
+
+
+def _decoded(text: str, n_tokens: int = 5, no_speech_prob: float = 0.0, avg_logprob: float = -0.2) -> MagicMock:
+    """Build a fake mlx_whisper DecodingResult."""
+    return MagicMock(
+        text=text, tokens=list(range(n_tokens)), no_speech_prob=no_speech_prob,
+        avg_logprob=avg_logprob, language="ja",
+    )
+
+
+@patch("mojiokoshi.transcriber.decode")
+@patch("mojiokoshi.transcriber.pad_or_trim")
+@patch("mojiokoshi.transcriber.log_mel_spectrogram")
+@patch("mojiokoshi.transcriber.ModelHolder.get_model")
+class TestTranscribeBatch:
+    """Tests for batched encode/decode of short utterances."""
+
+    @pytest.fixture(autouse=True)
+    def model_dims(self):
+        self.model = MagicMock()
+        self.model.dims.n_mels = 80
+        self.model.dims.n_text_ctx = 448
+
+    def test_mels_padded_and_stacked(self, mock_get_model, mock_mel, mock_pad, mock_decode):
+        """Test that each utterance is padded to 30 s of mel frames and decoded in one batch."""
+        mock_get_model.return_value = self.model
+        mock_pad.return_value = mx.zeros((N_FRAMES, 80), dtype=mx.float32)
+        mock_decode.return_value = [_decoded(" 一つ目 "), _decoded("二つ目")]
+        audios = [np.zeros(16000, dtype=np.float32), np.zeros(32000, dtype=np.float32)]
+
+        results = WhisperTranscriber().transcribe_batch(audios)
+
+        assert mock_mel.call_count == 2
+        assert all(c[0][0] is a for c, a in zip(mock_mel.call_args_list, audios))
+        assert mock_mel.call_args[1] == {"n_mels": 80, "padding": N_SAMPLES}
+        assert mock_pad.call_args[0][1] == N_FRAMES
+        assert mock_pad.call_args[1] == {"axis": -2}
+        mel = mock_decode.call_args[0][1]
+        assert mel.shape == (2, N_FRAMES, 80)
+        assert mel.dtype == mx.float16
+        options = mock_decode.call_args[0][2]
+        assert options.without_timestamps is True
+        assert options.sample_len == 224
+        assert [r.text for r in results] == ["一つ目", "二つ目"]
+        assert results[1].segments == [{"start": 0.0, "end": 2.0, "text": "二つ目"}]
+
+    def test_silence_filtered(self, mock_get_model, mock_mel, mock_pad, mock_decode):
+        """Test that only confident no-speech results are dropped as hallucinations."""
+        mock_get_model.return_value = self.model
+        mock_pad.return_value = mx.zeros((N_FRAMES, 80), dtype=mx.float32)
+        mock_decode.return_value = [
+            _decoded("ご視聴ありがとうございました", no_speech_prob=0.9, avg_logprob=-1.5),
+            _decoded("はい", no_speech_prob=0.9, avg_logprob=-0.3),
+        ]
+
+        results = WhisperTranscriber().transcribe_batch([np.zeros(1600, dtype=np.float32)] * 2)
+
+        assert results[0].text == ""
+        assert results[0].segments == []
+        assert results[1].text == "はい"
+
+    def test_long_and_truncated_items_transcribed_individually(
+        self, mock_get_model, mock_mel, mock_pad, mock_decode
+    ):
+        """Test that >30 s audio and decodes cut at sample_len keep their position in the results."""
+        mock_get_model.return_value = self.model
+        mock_pad.return_value = mx.zeros((N_FRAMES, 80), dtype=mx.float32)
+        mock_decode.return_value = [_decoded("短い"), _decoded("途中まで", n_tokens=224)]
+        audios = [
+            np.zeros(16000, dtype=np.float32),
+            np.zeros(N_SAMPLES + 1, dtype=np.float32),
+            np.ones(16000, dtype=np.float32),
+        ]
+        transcriber = WhisperTranscriber()
+
+        with patch.object(transcriber, "transcribe_array") as mock_array:
+            mock_array.side_effect = lambda audio: TranscriptionResult(
+                text=f"個別{len(audio)}", segments=[], language="ja"
+            )
+            results = transcriber.transcribe_batch(audios)
+
+        assert mock_decode.call_args[0][1].shape[0] == 2
+        assert [r.text for r in results] == ["短い", f"個別{N_SAMPLES + 1}", "個別16000"]
+        assert mock_array.call_args_list[1][0][0] is audios[2]
+
+
+class TestIterAudioWindows:
+    """Tests for streaming audio windows from ffmpeg."""
+
+    @patch("mojiokoshi.transcriber.subprocess.Popen")
+    def test_windows_cut_at_quiet_point(self, mock_popen):
+        """Test that windows are cut in the quietest part of the tail and cover the whole audio."""
+        sr = 16000
+        audio = np.full(5 * sr, 0.5, dtype=np.float32)
+        audio[int(1.5 * sr):int(1.8 * sr)] = 0.0
+        pcm = (audio * 32768).astype(np.int16).tobytes()
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(pcm)
+        proc.wait.return_value = 0
+
+        windows = list(iter_audio_windows("audio.mp3", window_sec=2, search_sec=1))
+
+        assert sum(len(w) for w in windows) == len(audio)
+        assert all(len(w) <= 2 * sr for w in windows)
+        # 最初の区切りは無音区間（1.5〜1.8秒）の中に入る
+        assert 1.5 * sr <= len(windows[0]) <= 1.8 * sr
+
+    @patch("mojiokoshi.transcriber.subprocess.Popen")
+    def test_ffmpeg_failure_raises(self, mock_popen):
+        """Test that an ffmpeg decode error is reported."""
+        def fake_popen(cmd, stdout, stderr):
+            stderr.write(b"Invalid data found")
+            return mock_popen.return_value
+
+        mock_popen.side_effect = fake_popen
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(b"")
+        proc.wait.return_value = 1
+
+        with pytest.raises(RuntimeError, match="Invalid data found"):
+            list(iter_audio_windows("broken.mp3"))
+
+    def test_large_stderr_does_not_block(self):
+        """Test that ffmpeg writing more than a pipe buffer to stderr does not deadlock."""
+        # 1フレームごとに警告を出す破損ファイルを模し、パイプの容量を超えるstderrを書いてから音声を出力する
+        script = (
+            "import sys; sys.stderr.write('Header missing\\n' * 20000); "
+            "sys.stdout.buffer.write(bytes(2 * 16000))"
+        )
+        real_popen = subprocess.Popen
+
+        with patch(
+            "mojiokoshi.transcriber.subprocess.Popen",
+            side_effect=lambda cmd, **kwargs: real_popen([sys.executable, "-c", script], **kwargs),
+        ):
+            windows = list(iter_audio_windows("damaged.mp3", window_sec=2, search_sec=1))
+
+        assert sum(len(w) for w in windows) == 16000
+
 
 class TestTranscriptionResult:
     """Tests for TranscriptionResult dataclass."""